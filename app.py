@@ -1,30 +1,69 @@
-from flask import Flask
+from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from core.config import settings
+from core.access import token_is_revoked
+from core.db import get_db
+from core.indexes import ensure_indexes
+from core.json_provider import FastJSONProvider
+from core.security import HashingBusy
+from core.warmup import warm_up
 from routes.auth import auth_bp
 from routes.admin import admin_bp
 from routes.personnel import personnel_bp
 from routes.analytics import analytics_bp
+from routes.jobs import jobs_bp
+from routes.health import health_bp
 
-app = Flask(__name__)
-app.config["JWT_SECRET_KEY"] = settings.JWT_SECRET
-app.config["JWT_ACCESS_TOKEN_EXPIRES"] = settings.ACCESS_TOKEN_EXPIRES
 
-CORS(app)
-bcrypt = Bcrypt(app)
-jwt = JWTManager(app)
+def hashing_busy(e):
+    return jsonify({
+        "message": "Server busy, please retry shortly",
+        "statusCode": 503
+    }), 503, {"Retry-After": "1"}
 
-app.register_blueprint(auth_bp, url_prefix="/auth")
-app.register_blueprint(admin_bp, url_prefix="/admin")
-app.register_blueprint(personnel_bp, url_prefix="/personnels")
-app.register_blueprint(analytics_bp, url_prefix="/analytics")
 
-@app.route("/")
 def home():
     return "Hello World! The API is working "
 
+
+def create_app():
+    """
+    Builds the app. Nothing here needs a connection unless ENSURE_INDEXES or
+    WARM_UP is set; the Mongo client itself is created lazily per process.
+    """
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    app.config["JWT_SECRET_KEY"] = settings.JWT_SECRET
+    app.config["JWT_ACCESS_TOKEN_EXPIRES"] = settings.ACCESS_TOKEN_EXPIRES
+
+    CORS(app)
+    Bcrypt(app)
+    jwt = JWTManager(app)
+    jwt.token_in_blocklist_loader(token_is_revoked)
+
+    app.register_blueprint(auth_bp, url_prefix="/auth")
+    app.register_blueprint(admin_bp, url_prefix="/admin")
+    app.register_blueprint(personnel_bp, url_prefix="/personnels")
+    app.register_blueprint(analytics_bp, url_prefix="/analytics")
+    app.register_blueprint(jobs_bp, url_prefix="/jobs")
+    app.register_blueprint(health_bp)
+
+    app.register_error_handler(HashingBusy, hashing_busy)
+    app.add_url_rule("/", "home", home)
+
+    # Index definitions live in core/indexes.py; `python -m seed.sync_indexes`
+    # also drops obsolete ones and reports unused ones.
+    if settings.ENSURE_INDEXES:
+        ensure_indexes(get_db())
+
+    if settings.WARM_UP:
+        warm_up()
+
+    return app
+
+
 if __name__ == "__main__":
-    print("MongoDB connected!")
-    app.run(host="0.0.0.0", port=8080, debug=True)
\ No newline at end of file
+    app = create_app()
+    app.run(host="0.0.0.0", port=8080, debug=True)
@@ -0,0 +1,51 @@
+"""
+Password checks (logins) per second at each bcrypt cost: single-threaded,
+which is the per-core rate, and through the bounded pool with many
+concurrent callers.
+
+    python -m bench.bench_bcrypt [costs] [concurrency]   e.g. 10,11,12,13 32
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.security import hash_password, verify_password, bcrypt
+
+
+def rate(fn, duration=2.0):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def pooled_rate(fn, concurrency, duration=2.0):
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        done = 0
+        while time.perf_counter() < deadline:
+            fn()
+            done += 1
+        return done
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as callers:
+        total = sum(callers.map(lambda _: worker(), range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    costs = [int(c) for c in sys.argv[1].split(",")] if len(sys.argv) > 1 else [10, 11, 12, 13]
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    cpus = os.cpu_count() or 1
+
+    print(f"{cpus} CPUs, {concurrency} concurrent callers for the pooled rate")
+    print(f"{'cost':>4} {'ms/check':>9} {'logins/s/core':>14} {'pooled logins/s':>16}")
+    for cost in costs:
+        hashed = hash_password("correct horse", rounds=cost)
+        per_core = rate(lambda: bcrypt.check_password_hash(hashed, "correct horse"))
+        pooled = pooled_rate(lambda: verify_password("correct horse", hashed), concurrency)
+        print(f"{cost:>4} {1000 / per_core:>9.1f} {per_core:>14.1f} {pooled:>16.1f}")
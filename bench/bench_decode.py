@@ -0,0 +1,32 @@
+"""
+Decode + serialize time for a 10k-row personnel page as the listing reads it
+(BSON as returned by the server): default decoding, where ObjectId / datetime
+go through the JSON provider's `default`, against RESPONSE_CODEC_OPTIONS,
+which decodes them straight to their response form.
+
+    python -m bench.bench_decode [rows] [repeats]
+"""
+import sys
+import bson
+from flask import Flask
+from bson.codec_options import DEFAULT_CODEC_OPTIONS
+from core.codecs import RESPONSE_CODEC_OPTIONS
+from core.json_provider import FastJSONProvider
+from bench.bench_json import make_docs, shaped, timed
+
+
+def decode_and_dump(provider, data, codec_options):
+    page = bson.decode_all(data, codec_options)
+    return provider.dumps({"data": page})
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    provider = FastJSONProvider(Flask(__name__))
+    data = b"".join(bson.encode(doc) for doc in shaped(make_docs(count)))
+
+    print(f"{count} rows, best of {repeats}")
+    timed("default decode + dumps", lambda: decode_and_dump(provider, data, DEFAULT_CODEC_OPTIONS), repeats)
+    timed("response codec + dumps", lambda: decode_and_dump(provider, data, RESPONSE_CODEC_OPTIONS), repeats)
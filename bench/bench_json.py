@@ -0,0 +1,92 @@
+"""
+Serialization time for a 10k-row personnel page: the previous per-document
+transform + stdlib jsonify, and FastJSONProvider (stdlib and orjson, when
+installed) on documents shaped by the query.
+
+    python -m bench.bench_json [rows] [repeats]
+"""
+import sys
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import core.json_provider as json_provider
+from core.json_provider import FastJSONProvider
+
+
+def make_docs(count):
+    created = datetime(2024, 1, 1)
+    return [{
+        "_id": ObjectId(),
+        "first_name": f"First{i}",
+        "last_name": f"Last{i}",
+        "middle_name": None,
+        "army_number": f"N/{100000 + i}",
+        "phone_number": "08030000000",
+        "rank": "Cpl",
+        "bank": {"name": "Bank", "sort_code": "011"},
+        "acct_number": "0123456789",
+        "sub_sector": "Sector 1",
+        "location": None,
+        "remark": None,
+        "db_id": "665f1c2e8f1b2a3c4d5e6f70",
+        "status": "active",
+        "isDeleted": False,
+        "created_at": created + timedelta(minutes=i),
+    } for i in range(count)]
+
+
+def previous(provider, docs):
+    formatted = []
+    for p in docs:
+        p_formatted = p.copy()
+        p_formatted["id"] = str(p_formatted.pop("_id"))
+        p_formatted.pop("db_id", None)
+        formatted.append(p_formatted)
+    return provider.dumps({"data": formatted}, separators=(",", ":"))
+
+
+def shaped(docs):
+    # What the listing aggregation returns: _id as id, no db_id
+    return [
+        {"id": doc["_id"], **{k: v for k, v in doc.items() if k not in ("_id", "db_id")}}
+        for doc in docs
+    ]
+
+
+def timed(label, fn, repeats):
+    fn()  # warm up
+    best = min(_elapsed(fn) for _ in range(repeats))
+    print(f"{label:<34} {best * 1000:>8.1f} ms")
+
+
+def _elapsed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    app = Flask(__name__)
+    docs = make_docs(count)
+    page = shaped(docs)
+
+    default_provider = DefaultJSONProvider(app)
+    fast_provider = FastJSONProvider(app)
+    orjson = json_provider.orjson
+
+    print(f"{count} rows, best of {repeats}")
+    timed("previous: transform + stdlib", lambda: previous(default_provider, docs), repeats)
+
+    json_provider.orjson = None
+    timed("FastJSONProvider (stdlib)", lambda: fast_provider.dumps({"data": page}, separators=(",", ":")), repeats)
+    json_provider.orjson = orjson
+
+    if orjson is not None:
+        timed("FastJSONProvider (orjson)", lambda: fast_provider.dumps({"data": page}), repeats)
+    else:
+        print("FastJSONProvider (orjson)          not installed")
@@ -0,0 +1,57 @@
+"""
+Paginated-listing latency under concurrent load against a running server,
+e.g. to compare worker / thread counts or index changes on the same data.
+
+    python -m bench.bench_listing <token> <path> [requests] [concurrency]
+    python -m bench.bench_listing $TOKEN "/personnels/db/<db_id>?page=3&limit=50"
+
+BASE_URL (default http://localhost:8080) selects the server.
+"""
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from bench.bench_login import BASE_URL, percentile
+
+
+def fetch(token, path):
+    req = urllib.request.Request(f"{BASE_URL}{path}", headers={"Authorization": f"Bearer {token}"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+
+    token, path = sys.argv[1], sys.argv[2]
+    total = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 32
+
+    fetch(token, path)  # warm up
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: fetch(token, path), range(total)))
+    elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = sorted(latency * 1000 for _, latency in results)
+
+    print(f"{total} requests, {concurrency} concurrent, {BASE_URL}{path}")
+    print(f"status codes: {statuses}")
+    print(f"throughput:   {total / elapsed:.1f} requests/s")
+    print(
+        f"latency ms:   mean {statistics.mean(latencies):.1f}  p50 {percentile(latencies, 50):.1f}  "
+        f"p95 {percentile(latencies, 95):.1f}  p99 {percentile(latencies, 99):.1f}"
+    )
@@ -0,0 +1,67 @@
+"""
+Login latency under concurrent load against a running server. Run it once
+per build being compared (e.g. before/after a change) with the same
+account, concurrency and bcrypt cost.
+
+    python -m bench.bench_login <army_number> <password> [requests] [concurrency]
+
+BASE_URL (default http://localhost:8080) selects the server.
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:8080")
+
+
+def login(army_number, password):
+    body = json.dumps({"army_number": army_number, "password": password}).encode()
+    req = urllib.request.Request(
+        f"{BASE_URL}/auth/login", data=body, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def percentile(values, pct):
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit(__doc__)
+
+    army_number, password = sys.argv[1], sys.argv[2]
+    total = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    concurrency = int(sys.argv[4]) if len(sys.argv) > 4 else 16
+
+    login(army_number, password)  # warm up
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: login(army_number, password), range(total)))
+    elapsed = time.perf_counter() - start
+
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    latencies = sorted(latency * 1000 for _, latency in results)
+
+    print(f"{total} logins, {concurrency} concurrent, {BASE_URL}")
+    print(f"status codes: {statuses}")
+    print(f"throughput:   {total / elapsed:.1f} logins/s")
+    print(
+        f"latency ms:   mean {statistics.mean(latencies):.1f}  p50 {percentile(latencies, 50):.1f}  "
+        f"p95 {percentile(latencies, 95):.1f}  p99 {percentile(latencies, 99):.1f}"
+    )
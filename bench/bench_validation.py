@@ -0,0 +1,86 @@
+"""
+Rows/sec for bulk personnel validation: the previous Personnel(**item) +
+.dict() loop, TypeAdapter(List[Personnel]), the in-thread validate_personnel
+path and the process pool.
+
+    python -m bench.bench_validation [rows] [processes]
+"""
+import os
+import sys
+import time
+import warnings
+from typing import List
+from pydantic import TypeAdapter, ValidationError
+from models.personnel import Personnel
+from utils.validation import validate_personnel, validate_personnel_chunk, to_doc
+
+
+def make_rows(count):
+    rows = []
+    for i in range(count):
+        row = {
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "middle_name": "M",
+            "army_number": f"N/{100000 + i}",
+            "phone_number": "08030000000",
+            "rank": "Cpl",
+            "bank": {"name": "Bank", "sort_code": "011"},
+            "acct_number": "0123456789",
+            "sub_sector": "Sector 1",
+            "db_id": "665f1c2e8f1b2a3c4d5e6f70",
+        }
+        if i % 50 == 0:
+            del row["rank"]  # ~2% invalid rows
+        rows.append(row)
+    return rows
+
+
+def previous(rows):
+    results = []
+    for item in rows:
+        try:
+            results.append((Personnel(**item).dict(by_alias=False), None))
+        except ValidationError as e:
+            results.append((None, e.errors()))
+    return results
+
+
+list_adapter = TypeAdapter(List[Personnel])
+
+
+def list_adapter_validate(rows):
+    # One call for the whole list; on failure the valid rows must be re-run
+    try:
+        return [(to_doc(p), None) for p in list_adapter.validate_python(rows)]
+    except ValidationError as e:
+        failed = {error["loc"][0] for error in e.errors()}
+    valid = [row for i, row in enumerate(rows) if i not in failed]
+    return [(to_doc(p), None) for p in list_adapter.validate_python(valid)] + [(None, i) for i in failed]
+
+
+def timed(label, fn, rows):
+    fn(rows[:100])  # warm up (and start pool workers)
+    start = time.perf_counter()
+    results = fn(rows)
+    elapsed = time.perf_counter() - start
+    valid = sum(1 for doc, _ in results if doc is not None)
+    print(f"{label:<30} {len(rows) / elapsed:>12,.0f} rows/sec  ({valid} valid, {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    processes = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 2)
+    rows = make_rows(count)
+
+    warnings.simplefilter("ignore", DeprecationWarning)
+
+    print(f"{count} rows, {processes} processes, {os.cpu_count()} CPUs")
+    timed("previous Personnel(**item)", previous, rows)
+    timed("TypeAdapter(List[Personnel])", list_adapter_validate, rows)
+    timed("in-thread validate_personnel", validate_personnel_chunk, rows)
+    timed(
+        f"process pool x{processes}",
+        lambda r: validate_personnel(r, processes=processes, chunk_size=2000, min_parallel_rows=0),
+        rows
+    )
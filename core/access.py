@@ -0,0 +1,77 @@
+from functools import wraps
+from bson import ObjectId, errors
+from flask import g, jsonify, request
+from flask_jwt_extended import get_jwt
+from core.cache import TTLCache
+from core.config import settings
+from core.db import db
+from models.schema import Role
+
+# --- Token versions ---
+# Access tokens carry the user's token_version as the "tv" claim. Incrementing
+# the stored version revokes every token minted before it.
+# Versions are cached per worker for TOKEN_VERSION_TTL seconds, so most
+# requests are authorized without a database read.
+
+TOKEN_VERSION_CLAIM = "tv"
+MISSING_USER = -1
+
+token_versions = TTLCache(settings.TOKEN_VERSION_TTL, settings.TOKEN_VERSION_CACHE_SIZE)
+
+
+def current_token_version(user_id):
+    version = token_versions.get(user_id)
+    if version is None:
+        try:
+            user = db.users.find_one({"_id": ObjectId(user_id)}, {"token_version": 1})
+        except (errors.InvalidId, TypeError):
+            user = None
+        version = user.get("token_version", 0) if user else MISSING_USER
+        token_versions.set(user_id, version)
+    return version
+
+
+def token_is_revoked(jwt_header, jwt_payload):
+    """token_in_blocklist_loader: rejects tokens of deleted users or from before a version bump."""
+    version = current_token_version(jwt_payload["sub"])
+    return version == MISSING_USER or jwt_payload.get(TOKEN_VERSION_CLAIM, 0) != version
+
+
+# --- DB access ---
+
+def is_admin():
+    return get_jwt().get("role") == Role.admin.value
+
+
+def allowed_db_ids():
+    """The token's allowed_dbs as a set, built once per request."""
+    if "allowed_db_ids" not in g:
+        g.allowed_db_ids = frozenset(str(db_id) for db_id in get_jwt().get("allowed_dbs", []))
+    return g.allowed_db_ids
+
+
+def has_db_access(db_id):
+    return is_admin() or str(db_id) in allowed_db_ids()
+
+
+def db_scope():
+    """Query condition limiting personnel to the DBs the token may access."""
+    return {} if is_admin() else {"db_id": {"$in": sorted(allowed_db_ids())}}
+
+
+def db_access_denied():
+    return jsonify({"message": "You do not have access to this DB", "statusCode": 403}), 403
+
+
+def db_access_required(view):
+    """
+    Rejects the request with 403 unless the token grants access to the DB in
+    the `db_id` URL or query argument. Use below @jwt_required().
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        db_id = kwargs.get("db_id") or request.args.get("db_id")
+        if db_id and not has_db_access(db_id):
+            return db_access_denied()
+        return view(*args, **kwargs)
+    return wrapper
@@ -10,8 +10,67 @@ class Settings:
         raise ValueError("MONGO_URI is not set in the environment!")
     
     MONGO_DB = os.getenv("MONGO_DB", "office-payment-mgmt")
+
+    # MongoDB client: pool bounds, how long a request may wait for a pooled
+    # connection (0 = no limit), server selection timeout, and wire
+    # compressors ("zstd,snappy,zlib"; empty = none)
+    MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", 100))
+    MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", 0))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", 0))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", 30000))
+    MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+
+    # /ready fails once more than this many requests wait for a pooled connection
+    READY_MAX_WAITING = int(os.getenv("READY_MAX_WAITING", 10))
+    # ...and when MongoDB does not answer its ping within this many milliseconds
+    READY_PING_TIMEOUT_MS = int(os.getenv("READY_PING_TIMEOUT_MS", 1500))
+
+    # Startup (create_app): create missing indexes, and prime caches / models
+    # before the worker takes traffic. Both connect at startup (in every worker,
+    # or in the master with --preload); indexes are normally a deploy step
+    # (python -m seed.sync_indexes)
+    ENSURE_INDEXES = os.getenv("ENSURE_INDEXES", "false").lower() in ("1", "true", "yes")
+    WARM_UP = os.getenv("WARM_UP", "false").lower() in ("1", "true", "yes")
+
     JWT_SECRET = os.getenv("JWT_SECRET", "supersecret")
     ACCESS_TOKEN_EXPIRES = timedelta(minutes=int(os.getenv("ACCESS_EXPIRES", 60)))
 
+    # bcrypt work factor for new hashes (older hashes are upgraded at login),
+    # hashing threads per process (0 = one per CPU) and max queued operations
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", 0))
+    BCRYPT_MAX_PENDING = int(os.getenv("BCRYPT_MAX_PENDING", 64))
+
+    # Seconds a worker may trust its cached copy of a user's token version,
+    # i.e. how long a revoked token can still be accepted by another worker
+    TOKEN_VERSION_TTL = int(os.getenv("TOKEN_VERSION_TTL", 30))
+    TOKEN_VERSION_CACHE_SIZE = int(os.getenv("TOKEN_VERSION_CACHE_SIZE", 10000))
+
+    # Analytics response cache (seconds / max entries per worker)
+    ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 30))
+    ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", 256))
+
+    # DB directory cache: max age of the in-process copy of `dbs` (seconds) and
+    # the minimum gap between reloads forced by unknown ids
+    DB_DIRECTORY_TTL = float(os.getenv("DB_DIRECTORY_TTL", 5))
+    DB_DIRECTORY_MISS_REFRESH = float(os.getenv("DB_DIRECTORY_MISS_REFRESH", 1))
+
+    # Streaming personnel import: rows validated/inserted per chunk, failures kept in the response
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 1000))
+    IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 1000))
+
+    # Documents fetched per cursor batch by the streaming export
+    EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+    # Bulk validation: worker processes (0 = in-thread only), rows per chunk,
+    # and the batch size from which the process pool is used
+    VALIDATION_PROCESSES = int(os.getenv("VALIDATION_PROCESSES", 0))
+    VALIDATION_CHUNK_SIZE = int(os.getenv("VALIDATION_CHUNK_SIZE", 500))
+    VALIDATION_PARALLEL_MIN_ROWS = int(os.getenv("VALIDATION_PARALLEL_MIN_ROWS", 2000))
+
+    # Background jobs: worker threads per process, days finished jobs are kept
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", 2))
+    JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", 7))
+
 
 settings = Settings()
\ No newline at end of file
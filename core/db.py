@@ -1,16 +1,60 @@
-from core.config import settings
+import os
+from threading import Lock
 from pymongo import MongoClient
+from core.config import settings
+from core.telemetry import new_pool_telemetry
+
+_client = None
+_client_pid = None
+_client_lock = Lock()
+
+
+def client_options(telemetry):
+    """
+    Pool, timeout and compression options shared by the PyMongo and Motor
+    clients; `telemetry` is the client's own pool listener.
+    """
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "event_listeners": [telemetry],
+    }
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return options
+
+
+def get_client():
+    """This process's MongoClient, created on first use (and again after a fork)."""
+    global _client, _client_pid
+    if _client is not None and _client_pid == os.getpid():
+        return _client
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client = MongoClient(settings.MONGO_URI, **client_options(new_pool_telemetry("sync")))
+            _client_pid = os.getpid()
+        return _client
+
+
+def get_db():
+    return get_client()[settings.MONGO_DB]
+
+
+class LazyDatabase:
+    """
+    Module-level stand-in for the Database: attribute and item access go to
+    the current process's client, so importing this module opens no
+    connection and pre-fork servers never share a client across workers.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_db(), name)
 
+    def __getitem__(self, name):
+        return get_db()[name]
 
-client = MongoClient(settings.MONGO_URI)
-db = client[settings.MONGO_DB]
 
-db.users.create_index("army_number", unique=True)
-db.users.create_index("first_name")
-db.users.create_index("last_name")
-db.dbs.create_index("name")
-db.dbs.create_index("short_code")
-db.personnels.create_index("army_number", unique=True)
-db.personnels.create_index("first_name")
-db.personnels.create_index("last_name")
-db.personnels.create_index("middle_name")
\ No newline at end of file
+db = LazyDatabase()
@@ -0,0 +1,80 @@
+import time
+from threading import Lock
+from bson import ObjectId, errors
+from core.config import settings
+from core.db import db
+
+DIRECTORY_PROJECTION = {"name": 1, "short_code": 1, "description": 1, "created_at": 1}
+
+
+class DBDirectory:
+    """
+    In-process snapshot of the (small, rarely written) `dbs` collection, keyed
+    by string id. The snapshot is reloaded when older than `ttl` seconds,
+    right after this process writes to `dbs` (refresh()), and on a lookup
+    miss at most once per `miss_refresh_interval` seconds, so DBs created by
+    other workers show up without a restart. Each reload bumps `version`.
+    """
+
+    def __init__(self, ttl, miss_refresh_interval):
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+        self.version = 0
+        self._dbs = {}
+        self._loaded_at = None
+        self._lock = Lock()
+
+    def _load(self):
+        dbs = {str(doc["_id"]): doc for doc in db.dbs.find({}, DIRECTORY_PROJECTION)}
+        self._dbs = dbs
+        self._loaded_at = time.monotonic()
+        self.version += 1
+        return dbs
+
+    def _age(self):
+        return time.monotonic() - self._loaded_at if self._loaded_at is not None else None
+
+    def _snapshot(self):
+        age = self._age()
+        if age is not None and age < self.ttl:
+            return self._dbs
+        with self._lock:
+            age = self._age()
+            if age is not None and age < self.ttl:
+                return self._dbs
+            return self._load()
+
+    def _refresh_on_miss(self, version):
+        """Reloads after a miss unless another reload happened since `version` or too recently."""
+        with self._lock:
+            if self.version == version and self._age() >= self.miss_refresh_interval:
+                self._load()
+            return self._dbs
+
+    def refresh(self):
+        with self._lock:
+            self._load()
+
+    def get_many(self, db_ids):
+        """Returns {db_id: doc} for the ids that exist; unknown or malformed ids are left out."""
+        keys = {}
+        for db_id in db_ids:
+            try:
+                keys[str(db_id)] = str(ObjectId(db_id))
+            except (errors.InvalidId, TypeError):
+                continue
+
+        version = self.version
+        dbs = self._snapshot()
+        if any(key not in dbs for key in keys.values()):
+            dbs = self._refresh_on_miss(version)
+        return {db_id: dbs[key] for db_id, key in keys.items() if key in dbs}
+
+    def get(self, db_id):
+        return self.get_many([db_id]).get(str(db_id))
+
+    def exists(self, db_id):
+        return self.get(db_id) is not None
+
+
+db_directory = DBDirectory(settings.DB_DIRECTORY_TTL, settings.DB_DIRECTORY_MISS_REFRESH)
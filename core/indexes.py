@@ -0,0 +1,140 @@
+from pymongo import IndexModel
+from core.config import settings
+from pymongo.errors import OperationFailure
+
+# Declarative index spec: every index the app relies on, per collection.
+# Index names are left to pymongo ("<field>_<dir>_..."), so indexes that
+# already exist under the default name are picked up as-is.
+INDEXES = {
+    "users": [
+        # Login / duplicate checks
+        {"keys": [("army_number", 1)], "unique": True},
+        # Admin user listing: role filter, keyset pagination by last_name;
+        # the trailing fields cover ?fields=first_name,last_name,army_number,role
+        {"keys": [("role", 1), ("last_name", 1), ("_id", 1), ("first_name", 1), ("army_number", 1)]},
+        # Name / army number search (see utils/search.py)
+        {"keys": [("search_tokens", 1)]},
+    ],
+    "dbs": [
+        # Duplicate check in create_db
+        {"keys": [("short_code", 1)]},
+        # DB listing, keyset pagination by name
+        {"keys": [("name", 1), ("_id", 1)]},
+    ],
+    "personnels": [
+        # army_number is unique per DB
+        {"keys": [("db_id", 1), ("army_number", 1)], "unique": True},
+        # Live-row listings by DB and status (queries carry isDeleted: false)
+        {"keys": [("db_id", 1), ("status", 1)], "partialFilterExpression": {"isDeleted": False}},
+        # Keyset pagination within a DB, by _id or by last_name
+        {"keys": [("db_id", 1), ("_id", 1)], "partialFilterExpression": {"isDeleted": False}},
+        # (the trailing fields cover the table columns selected with
+        # ?fields=first_name,last_name,army_number,rank,status, so those pages
+        # are answered from the index without fetching documents)
+        {
+            "keys": [
+                ("db_id", 1), ("last_name", 1), ("_id", 1),
+                ("first_name", 1), ("army_number", 1), ("rank", 1), ("status", 1), ("isDeleted", 1)
+            ],
+            "partialFilterExpression": {"isDeleted": False}
+        },
+        # Name / army number search within a DB (see utils/search.py)
+        {
+            "keys": [("db_id", 1), ("search_tokens", 1)],
+            "partialFilterExpression": {"isDeleted": False}
+        },
+    ],
+    "jobs": [
+        # Finished jobs expire after JOB_RETENTION_DAYS
+        {"keys": [("finished_at", 1)], "expireAfterSeconds": settings.JOB_RETENTION_DAYS * 86400},
+    ],
+    "stats": [
+        {
+            "keys": [("scope", 1), ("db_id", 1), ("status", 1), ("isDeleted", 1), ("month", 1)],
+            "unique": True
+        },
+    ],
+}
+
+# Options that make two indexes on the same keys different
+COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds")
+
+
+def index_models(collection_name, background=False):
+    models = []
+    for spec in INDEXES.get(collection_name, []):
+        options = {k: v for k, v in spec.items() if k != "keys"}
+        if background:
+            options["background"] = True
+        models.append(IndexModel(spec["keys"], **options))
+    return models
+
+
+def same_index(existing, wanted):
+    if list(existing["key"].items()) != list(wanted["key"].items()):
+        return False
+    return all(existing.get(opt) == wanted.get(opt) for opt in COMPARED_OPTIONS)
+
+
+def ensure_indexes(database):
+    """Creates the spec'd indexes that are missing; never drops or rebuilds anything."""
+    for collection_name in INDEXES:
+        collection = database[collection_name]
+        existing = {ix["name"] for ix in collection.list_indexes()}
+        missing = [m for m in index_models(collection_name) if m.document["name"] not in existing]
+        if missing:
+            collection.create_indexes(missing)
+
+
+def unused_indexes(collection):
+    """Names of indexes with no recorded accesses since the server started tracking them."""
+    try:
+        stats = collection.aggregate([{"$indexStats": {}}])
+        return sorted(
+            s["name"] for s in stats
+            if s["name"] != "_id_" and s.get("accesses", {}).get("ops", 0) == 0
+        )
+    except OperationFailure:
+        # $indexStats is not permitted for every role / deployment
+        return []
+
+
+def sync_indexes(database, drop=True, dry_run=False):
+    """
+    Brings every collection in line with INDEXES: builds missing indexes in the
+    background, rebuilds ones whose options changed and (with `drop`) removes
+    indexes that are no longer in the spec. Returns a per-collection report.
+    """
+    report = {}
+
+    for collection_name in INDEXES:
+        collection = database[collection_name]
+        existing = {ix["name"]: ix for ix in collection.list_indexes()}
+        wanted = {m.document["name"]: m for m in index_models(collection_name, background=True)}
+
+        created, rebuilt, dropped = [], [], []
+
+        for name, model in wanted.items():
+            if name not in existing:
+                created.append(name)
+            elif not same_index(existing[name], model.document):
+                rebuilt.append(name)
+
+        if drop:
+            dropped = [name for name in existing if name != "_id_" and name not in wanted]
+
+        if not dry_run:
+            for name in rebuilt + dropped:
+                collection.drop_index(name)
+            to_build = [wanted[name] for name in created + rebuilt]
+            if to_build:
+                collection.create_indexes(to_build)
+
+        report[collection_name] = {
+            "created": created,
+            "rebuilt": rebuilt,
+            "dropped": dropped,
+            "unused": [name for name in unused_indexes(collection) if name not in dropped],
+        }
+
+    return report
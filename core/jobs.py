@@ -0,0 +1,95 @@
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
+from core.config import settings
+from core.db import db
+from utils.bulk import insert_personnel_batch
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_pid = None
+_executor_lock = Lock()
+
+
+def get_executor():
+    """Per-process worker pool, created on first use (and again after a fork)."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.JOB_WORKERS,
+                thread_name_prefix="jobs"
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def create_job(job_type, total, **fields):
+    job = {
+        "type": job_type,
+        "status": QUEUED,
+        "total": total,
+        "processed": 0,
+        "inserted": 0,
+        "failedCount": 0,
+        "failed": [],
+        "error": None,
+        "created_at": datetime.utcnow(),
+        "started_at": None,
+        "finished_at": None,
+        **fields,
+    }
+    return db.jobs.insert_one(job).inserted_id
+
+
+def submit_personnel_upload(db_id, items, created_by):
+    """Persists a job for the upload and hands the rows to the worker pool."""
+    job_id = create_job("personnel_upload", len(items), db_id=db_id, created_by=created_by)
+    get_executor().submit(run_personnel_upload, job_id, db_id, items)
+    return job_id
+
+
+def run_personnel_upload(job_id, db_id, items):
+    db.jobs.update_one(
+        {"_id": job_id},
+        {"$set": {"status": RUNNING, "started_at": datetime.utcnow()}}
+    )
+
+    try:
+        chunk_size = settings.IMPORT_CHUNK_SIZE
+        for offset in range(0, len(items), chunk_size):
+            chunk = items[offset:offset + chunk_size]
+            inserted, failed = insert_personnel_batch(db_id, chunk, offset=offset)
+
+            # Pydantic error details may hold values BSON cannot encode
+            failed = json.loads(json.dumps(failed, default=str))
+
+            db.jobs.update_one(
+                {"_id": job_id},
+                {
+                    "$inc": {"processed": len(chunk), "inserted": inserted, "failedCount": len(failed)},
+                    "$push": {"failed": {"$each": failed, "$slice": settings.IMPORT_MAX_REPORTED_ERRORS}}
+                }
+            )
+    except Exception as e:
+        db.jobs.update_one(
+            {"_id": job_id},
+            {"$set": {"status": FAILED, "error": str(e), "finished_at": datetime.utcnow()}}
+        )
+        # Nothing waits on the executor's future, so log here or the traceback is lost
+        logger.exception("Upload job %s failed", job_id)
+        return
+
+    db.jobs.update_one(
+        {"_id": job_id},
+        {"$set": {"status": COMPLETED, "finished_at": datetime.utcnow()}}
+    )
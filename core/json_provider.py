@@ -0,0 +1,47 @@
+from datetime import date, datetime
+from enum import Enum
+from bson import ObjectId
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson
+except ImportError:  # optional: `uv add orjson`
+    orjson = None
+
+
+def encode_default(o):
+    """ObjectId -> str, Enum -> value; datetimes keep Flask's HTTP-date format."""
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, Enum):
+        return o.value
+    if isinstance(o, (datetime, date)):
+        return http_date(o)
+    return DefaultJSONProvider.default(o)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes Mongo documents as-is (ObjectId, datetime,
+    enums), using orjson when it is installed and the stdlib encoder otherwise.
+    Output matches DefaultJSONProvider: sorted keys, HTTP-date datetimes.
+    """
+
+    default = staticmethod(encode_default)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None:
+            return super().dumps(obj, **kwargs)
+
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
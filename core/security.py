@@ -1,8 +1,62 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
 from flask_bcrypt import Bcrypt
+from core.config import settings
+
 bcrypt = Bcrypt()
 
-def hash_password(pwd: str) -> str:
-    return bcrypt.generate_password_hash(pwd).decode()
+# bcrypt runs on a small per-process pool (it releases the GIL while hashing),
+# so a burst of logins can use at most BCRYPT_WORKERS cores and never more than
+# BCRYPT_MAX_PENDING request threads wait on it; the rest get HashingBusy.
+
+_pool = None
+_pool_pid = None
+_pending = None
+_pool_lock = Lock()
+
+
+class HashingBusy(Exception):
+    """Too many password hash operations are already queued."""
+
+
+def get_pool():
+    """Per-process bcrypt pool and its pending-slot semaphore (recreated after a fork)."""
+    global _pool, _pool_pid, _pending
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ThreadPoolExecutor(
+                max_workers=settings.BCRYPT_WORKERS or os.cpu_count() or 1,
+                thread_name_prefix="bcrypt"
+            )
+            _pending = BoundedSemaphore(settings.BCRYPT_MAX_PENDING)
+            _pool_pid = os.getpid()
+        return _pool, _pending
+
+
+def run_hashing(fn, *args):
+    pool, pending = get_pool()
+    if not pending.acquire(blocking=False):
+        raise HashingBusy()
+    try:
+        return pool.submit(fn, *args).result()
+    finally:
+        pending.release()
+
+
+def hash_password(pwd: str, rounds: int = None) -> str:
+    rounds = rounds or settings.BCRYPT_ROUNDS
+    return run_hashing(bcrypt.generate_password_hash, pwd, rounds).decode()
 
 def verify_password(pwd: str, hashed: str) -> bool:
-    return bcrypt.check_password_hash(hashed, pwd)
\ No newline at end of file
+    return run_hashing(bcrypt.check_password_hash, hashed, pwd)
+
+def hash_rounds(hashed: str):
+    """Work factor of a bcrypt hash ("$2b$12$..." -> 12), or None if unreadable."""
+    try:
+        return int(hashed.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+def needs_rehash(hashed: str) -> bool:
+    return hash_rounds(hashed) != settings.BCRYPT_ROUNDS
@@ -0,0 +1,174 @@
+from collections import Counter
+from datetime import datetime
+from pymongo import UpdateOne
+from core.db import db
+from core.cache import analytics_cache, invalidate_analytics
+from utils.helpers import is_deleted
+
+# Counter documents in the `stats` collection are keyed by
+# (scope, db_id, status, isDeleted, month); users and dbs only use scope + month.
+PERSONNELS = "personnels"
+USERS = "users"
+DBS = "dbs"
+
+KEY_FIELDS = ("scope", "db_id", "status", "isDeleted", "month")
+
+
+def month_key(created_at):
+    if isinstance(created_at, datetime):
+        return created_at.strftime("%Y-%m")
+    return None
+
+
+# Personnel fields personnel_key() reads: updates touching none of them leave counters alone
+PERSONNEL_KEY_FIELDS = ("db_id", "status", "isDeleted", "created_at")
+PERSONNEL_KEY_PROJECTION = {field: 1 for field in PERSONNEL_KEY_FIELDS}
+
+
+def personnel_key(doc):
+    status = doc.get("status")
+    return (
+        PERSONNELS,
+        doc.get("db_id"),
+        getattr(status, "value", status),
+        is_deleted(doc),
+        month_key(doc.get("created_at")),
+    )
+
+
+def personnel_guard(doc):
+    """
+    Filter matching the personnel `doc` only while its key fields still hold
+    the values read. A write through it that modifies the row moves exactly
+    the counters of the transition it made, whatever runs concurrently.
+    """
+    return {"_id": doc["_id"], **{field: doc.get(field) for field in PERSONNEL_KEY_FIELDS}}
+
+
+def scope_key(scope, doc):
+    return (scope, None, None, None, month_key(doc.get("created_at")))
+
+
+def key_filter(key):
+    return dict(zip(KEY_FIELDS, key))
+
+
+def apply_deltas(deltas):
+    """
+    $inc every counter in `deltas` ({key: change}) in one bulk write and drops
+    the cached analytics responses that read them.
+    """
+    changed = [(key, change) for key, change in deltas.items() if change]
+    if not changed:
+        return
+
+    db.stats.bulk_write([
+        UpdateOne(key_filter(key), {"$inc": {"count": change}}, upsert=True)
+        for key, change in changed
+    ], ordered=False)
+
+    invalidate_analytics({key[1] for key, _ in changed if key[0] == PERSONNELS})
+
+
+def record_personnel_created(docs):
+    apply_deltas(Counter(personnel_key(doc) for doc in docs))
+
+
+def record_personnel_changed(pairs):
+    """Moves counters for each (before, after) pair whose key changed."""
+    deltas = Counter()
+    for before, after in pairs:
+        old_key, new_key = personnel_key(before), personnel_key(after)
+        if old_key != new_key:
+            deltas[old_key] -= 1
+            deltas[new_key] += 1
+    apply_deltas(deltas)
+
+
+def record_created(scope, docs):
+    apply_deltas(Counter(scope_key(scope, doc) for doc in docs))
+
+
+def record_removed(scope, docs):
+    deltas = Counter()
+    for doc in docs:
+        deltas[scope_key(scope, doc)] -= 1
+    apply_deltas(deltas)
+
+
+# --- Rebuild ---
+
+MONTH_OF_CREATED_AT = {"$dateToString": {"format": "%Y-%m", "date": "$created_at"}}
+
+
+def compute_counters(db_ids=None):
+    """Recounts every counter from the source collections (only those personnel DBs when `db_ids` is given)."""
+    counters = Counter()
+
+    match = [{"$match": {"db_id": {"$in": list(db_ids)}}}] if db_ids is not None else []
+    personnels = db.personnels.aggregate(match + [
+        {"$group": {
+            "_id": {
+                "db_id": "$db_id",
+                "status": "$status",
+                "isDeleted": "$isDeleted",
+                "month": MONTH_OF_CREATED_AT,
+            },
+            "count": {"$sum": 1}
+        }}
+    ])
+    for row in personnels:
+        group = row["_id"]
+        key = (
+            PERSONNELS,
+            group.get("db_id"),
+            group.get("status"),
+            is_deleted(group),
+            group.get("month"),
+        )
+        counters[key] += row["count"]
+
+    if db_ids is not None:
+        return counters
+
+    for scope, collection in ((USERS, db.users), (DBS, db.dbs)):
+        rows = collection.aggregate([
+            {"$group": {"_id": MONTH_OF_CREATED_AT, "count": {"$sum": 1}}}
+        ])
+        for row in rows:
+            counters[(scope, None, None, None, row["_id"])] += row["count"]
+
+    return counters
+
+
+def stored_counters(db_ids=None):
+    query = {} if db_ids is None else {"scope": PERSONNELS, "db_id": {"$in": list(db_ids)}}
+    return Counter({
+        tuple(doc.get(field) for field in KEY_FIELDS): doc.get("count", 0)
+        for doc in db.stats.find(query, {"_id": 0})
+    })
+
+
+def reconcile_counters(apply=True, db_ids=None):
+    """
+    Compares stored counters with a fresh recount and returns the drift as
+    {key: (stored, actual)}. When `apply` is set, drifted counters are overwritten.
+    With `db_ids`, only the personnel counters of those DBs are checked.
+    """
+    actual = compute_counters(db_ids)
+    stored = stored_counters(db_ids)
+
+    drift = {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in set(actual) | set(stored)
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+    if apply and drift:
+        db.stats.bulk_write([
+            UpdateOne(key_filter(key), {"$set": {"count": count}}, upsert=True)
+            for key, (_, count) in drift.items()
+        ], ordered=False)
+        analytics_cache.clear()
+
+    return drift
@@ -0,0 +1,95 @@
+import os
+from threading import Lock
+from pymongo import monitoring
+
+
+class PoolTelemetry(monitoring.ConnectionPoolListener):
+    """
+    Live connection-pool counters of one client in this process, fed by
+    PyMongo's pool events (summed over every server the client talks to).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.open = 0
+            self.checked_out = 0
+            self.waiting = 0
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.pool_clears = 0
+
+    def _add(self, **changes):
+        with self._lock:
+            for name, change in changes.items():
+                setattr(self, name, getattr(self, name) + change)
+
+    def connection_check_out_started(self, event):
+        self._add(waiting=1)
+
+    def connection_checked_out(self, event):
+        self._add(waiting=-1, checked_out=1, checkouts=1)
+
+    def connection_check_out_failed(self, event):
+        self._add(waiting=-1, checkout_failures=1)
+
+    def connection_checked_in(self, event):
+        self._add(checked_out=-1)
+
+    def connection_created(self, event):
+        self._add(open=1)
+
+    def connection_closed(self, event):
+        self._add(open=-1)
+
+    def pool_cleared(self, event):
+        self._add(pool_clears=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "open": self.open,
+                "checkedOut": self.checked_out,
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "checkoutFailures": self.checkout_failures,
+                "poolClears": self.pool_clears,
+            }
+
+
+# One listener per client (named, e.g. "sync" for get_client()), each tagged with
+# the process that created it, so pools are reported and judged separately
+# and a forked worker never reports its parent's pools.
+_pools = {}
+
+
+def new_pool_telemetry(name):
+    """Fresh listener for the `name` client being created in this process."""
+    telemetry = PoolTelemetry()
+    _pools[name] = (os.getpid(), telemetry)
+    return telemetry
+
+
+def pool_snapshots():
+    """{name: snapshot} for the clients this process has created."""
+    pid = os.getpid()
+    return {
+        name: telemetry.snapshot()
+        for name, (owner, telemetry) in sorted(_pools.items())
+        if owner == pid
+    }
@@ -0,0 +1,25 @@
+from core.db import get_db
+from core.directory import db_directory
+from models.personnel import CreateDBSchema
+from models.schema import LoginSchema, CreateUserSchema
+from utils.validation import validate_personnel_chunk
+
+SAMPLE_PERSONNEL = {
+    "first_name": "Warm", "last_name": "Up", "army_number": "N/0", "phone_number": "0",
+    "rank": "Pte", "bank": {"name": "Bank", "sort_code": "0"}, "acct_number": "0",
+    "sub_sector": "0", "db_id": "000000000000000000000000",
+}
+
+
+def warm_up():
+    """
+    Primes per-process state before the worker takes traffic: opens the
+    connection pool, loads the DB directory and runs the Pydantic models once.
+    """
+    get_db().command("ping")
+    db_directory.refresh()
+
+    validate_personnel_chunk([SAMPLE_PERSONNEL])
+    LoginSchema(army_number="N/0", password="x")
+    CreateUserSchema(first_name="Warm", last_name="Up", army_number="N/0").dict()
+    CreateDBSchema(name="Warm", short_code="W", description="").dict()
@@ -1,4 +1,4 @@
-from pydantic import Field, BaseModel, model_validator
+from pydantic import Field, BaseModel, create_model, model_validator
 from datetime import datetime
 from enum import Enum
 from typing import Optional, List
@@ -43,6 +43,38 @@ class Personnel(BaseMongoModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+# Personnel fields that may be cleared (set to null) by an update: the ones defaulting to None
+NULLABLE_PERSONNEL_FIELDS = tuple(
+    name for name, field in Personnel.model_fields.items()
+    if name != "id" and not field.is_required() and field.default is None
+)
+
+
+class PersonnelUpdateBase(BaseModel):
+    @model_validator(mode="after")
+    def only_optional_fields_null(self):
+        nulled = [
+            name for name in self.model_fields_set
+            if getattr(self, name) is None and name not in NULLABLE_PERSONNEL_FIELDS
+        ]
+        if nulled:
+            raise ValueError(f"Fields cannot be null: {', '.join(sorted(nulled))}")
+        return self
+
+
+# PATCH body: every Personnel field (but id), optional, so only the ones sent
+# are validated and applied. Derived from Personnel so new fields are patchable.
+PersonnelUpdate = create_model(
+    "PersonnelUpdate",
+    __base__=PersonnelUpdateBase,
+    **{
+        name: (Optional[field.annotation], None)
+        for name, field in Personnel.model_fields.items()
+        if name != "id"
+    }
+)
+
+
 class PersonnelBulkUpload(BaseModel):
     personnel: List[Personnel]
 
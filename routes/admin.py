@@ -5,8 +5,22 @@ from models.schema import CreateUserSchema, Role, ResetPasswordSchema
 from models.personnel import CreateDBSchema
 from pydantic import ValidationError
 from core.db import db
+from core.directory import db_directory
+from core.access import token_versions, is_admin, allowed_db_ids
+from core.stats import record_created, record_removed, USERS, DBS
 from bson import ObjectId, errors
 from math import ceil
+from utils.helpers import find_page_by_cursor, find_page_by_offset, cursor_meta, parse_fields, field_projection
+from utils.search import search_tokens, search_condition, USER_SEARCH_FIELDS, SEARCH_MODES
+from utils.dbs import resolve_allowed_dbs
+import re
+
+# Fields a caller may select with ?fields= on the user listing (id is always returned)
+USER_FIELDS = ("first_name", "last_name", "army_number", "role", "allowed_dbs", "is_generated")
+
+# Sort orders accepted in cursor mode (?sort=) and the fields they page on
+USER_CURSOR_SORTS = {"id": "_id", "last_name": "last_name"}
+DB_CURSOR_SORTS = {"id": "_id", "name": "name"}
 
 
 admin_bp = Blueprint("admin", __name__)
@@ -57,7 +71,7 @@ def create_user():
     for db_id in allowed:
         # Ensure valid ObjectId
         try:
-            obj_id = ObjectId(db_id)
+            ObjectId(db_id)
         except:
             return jsonify({
                 "message": "Invalid DB ID format",
@@ -66,7 +80,7 @@ def create_user():
             }), 400
 
         # Ensure the DB exists
-        if not db.dbs.find_one({"_id": obj_id}):
+        if not db_directory.exists(db_id):
             return jsonify({
                 "message": "Database not found",
                 "statusCode": 404,
@@ -95,9 +109,10 @@ def create_user():
         }), 400
 
     # Insert into MongoDB
-    result = db.users.insert_one(
-        user_schema.dict(by_alias=True, exclude_none=True)
-    )
+    user_doc = user_schema.dict(by_alias=True, exclude_none=True)
+    user_doc["search_tokens"] = search_tokens(user_doc, USER_SEARCH_FIELDS)
+    result = db.users.insert_one(user_doc)
+    record_created(USERS, [user_doc])
 
     return jsonify({
         "message": "User created successfully",
@@ -146,8 +161,8 @@ def update_user(userId: str):
             "statusCode": 400
         }), 400
 
-    # Fetch all valid DB IDs
-    existing_ids = {str(d["_id"]) for d in db.dbs.find({}, {"_id": 1})}
+    # Known DB IDs, from the in-process directory
+    existing_ids = db_directory.get_many(requested_ids)
 
     # Compare
     invalid = [str(id) for id in requested_ids if id not in existing_ids]
@@ -177,12 +192,20 @@ def update_user(userId: str):
     except ValidationError as e:
         return jsonify({"message": e.errors(), "statusCode": 400}), 400
 
+    update_doc = validated.dict(by_alias=False, exclude_none=True, exclude={"password_hash"})
+    update_doc["search_tokens"] = search_tokens(update_doc, USER_SEARCH_FIELDS)
+
+    update = {"$set": update_doc}
+
+    # A change to the allowed DBs revokes the user's existing tokens (stale claims)
+    claims_changed = update_doc.get("allowed_dbs", []) != user_json["allowed_dbs"]
+    if claims_changed:
+        update["$inc"] = {"token_version": 1}
+
     # Update
-    db.users.update_one(
-        {"_id": obj_id},
-        {"$set": validated.dict(
-            by_alias=False, exclude_none=True, exclude={"password_hash"})}
-    )
+    db.users.update_one({"_id": obj_id}, update)
+    if claims_changed:
+        token_versions.invalidate(userId)
 
     return jsonify({
         "message": "User updated successfully",
@@ -228,6 +251,8 @@ def delete_user(userId: str):
 
     # Delete user
     db.users.delete_one({"_id": obj_id})
+    token_versions.invalidate(userId)
+    record_removed(USERS, [user])
 
     return jsonify({
         "message": "User deleted successfully",
@@ -293,6 +318,8 @@ def get_all_users():
     page = int(request.args.get("page", 1))
     limit = int(request.args.get("limit", 10))
     search = request.args.get("search", "")
+    search_mode = request.args.get("search_mode", "prefix")
+    sort = request.args.get("sort", "id")
 
     if page < 1:
         page = 1
@@ -301,59 +328,87 @@ def get_all_users():
 
     skip = (page - 1) * limit
 
+    try:
+        fields = parse_fields(request.args.get("fields"), USER_FIELDS)
+    except ValueError as e:
+        return jsonify({"message": str(e), "statusCode": 400, "data": {}}), 400
+
     # Build query
     query = {"role": {"$ne": "admin"}}
 
     if search:
-        query["$or"] = [
-            {"first_name": {"$regex": search, "$options": "i"}},
-            {"last_name": {"$regex": search, "$options": "i"}},
-            {"army_number": {"$regex": search, "$options": "i"}},
-        ]
+        if search_mode not in SEARCH_MODES:
+            return jsonify({
+                "message": f"Invalid search_mode value. Must be one of: {', '.join(SEARCH_MODES)}",
+                "statusCode": 400,
+                "data": {}
+            }), 400
 
-    # Count total users
-    total = db.users.count_documents(query)
+        condition = search_condition(search, USER_SEARCH_FIELDS, search_mode)
+        if condition:
+            query.update(condition)
 
-    # Fetch users with pagination
-    users = list(
-        db.users.find(query)
-        .skip(skip)
-        .limit(limit)
-    )
+    # Cursor mode: keyset pagination, selected by passing `cursor` (empty for the first page)
+    if "cursor" in request.args:
+        if sort not in USER_CURSOR_SORTS:
+            return jsonify({
+                "message": f"Invalid sort value. Must be one of: {', '.join(USER_CURSOR_SORTS)}",
+                "statusCode": 400,
+                "data": {}
+            }), 400
+
+        try:
+            projection = None if fields is None else field_projection(fields, USER_CURSOR_SORTS[sort])
+            users, next_cursor = find_page_by_cursor(
+                db.users, query, request.args.get("cursor"), limit, USER_CURSOR_SORTS[sort], projection
+            )
+        except ValueError as e:
+            return jsonify({"message": str(e), "statusCode": 400, "data": {}}), 400
+
+        pagination = cursor_meta(limit, next_cursor)
+    else:
+        # Count total users and fetch the page
+        projection = None if fields is None else field_projection(fields)
+        total, users = find_page_by_offset(db.users, query, skip, limit, projection)
+
+        # Pagination metadata
+        page_count = ceil(total / limit) if total else 1
+        pagination = {
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pageCount": page_count,
+            "hasNextPage": page < page_count,
+            "hasPrevPage": page > 1,
+        }
+
+    # Populate allowed_dbs with full DB details, one lookup for the whole page
+    if fields is None or "allowed_dbs" in fields:
+        allowed_dbs = resolve_allowed_dbs([user.get("allowed_dbs") for user in users])
+    else:
+        allowed_dbs = [None] * len(users)
 
     clean_users = []
-    for user in users:
+    for user, user_dbs in zip(users, allowed_dbs):
+        if fields is not None:
+            # Only the selected fields, as the full response would render them
+            clean_user = {"id": str(user.pop("_id"))}
+            for name in fields:
+                clean_user[name] = user.get(name, False if name == "is_generated" else None)
+            if user_dbs is not None:
+                clean_user["allowed_dbs"] = user_dbs
+            clean_users.append(clean_user)
+            continue
+
         user.pop("password_hash", None)
         user.pop("created_at", None)
-
-        # Populate allowed_dbs with full DB details
-        if user.get("allowed_dbs"):
-            object_ids = [ObjectId(db_id) for db_id in user["allowed_dbs"]]
-            db_docs = list(db.dbs.find({"_id": {"$in": object_ids}}))
-            full_dbs = [
-                CreateDBSchema(**db_doc).dict(by_alias=False, exclude={"created_at"})
-                for db_doc in db_docs
-            ]
-            user["allowed_dbs"] = full_dbs
-        else:
-            user["allowed_dbs"] = []
+        user["allowed_dbs"] = user_dbs
 
         clean_user = CreateUserSchema(**user).dict(
             exclude={"password_hash", "created_at"}, by_alias=False
         )
         clean_users.append(clean_user)
 
-    # Pagination metadata
-    page_count = ceil(total / limit) if total else 1
-    pagination = {
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "pageCount": page_count,
-        "hasNextPage": page < page_count,
-        "hasPrevPage": page > 1,
-    }
-
     return jsonify({
         "message": "Users fetched successfully",
         "statusCode": 200,
@@ -398,6 +453,8 @@ def create_db():
 
     # Insert into MongoDB
     db.dbs.insert_one(db_dict)
+    db_directory.refresh()
+    record_created(DBS, [db_dict])
 
     return jsonify({
         "message": "Database created successfully",
@@ -454,19 +511,10 @@ from bson import ObjectId
 @admin_bp.get("/dbs")
 @jwt_required()
 def get_all_dbs_paginated():
-    current_user_id = get_jwt_identity()
-    user = db.users.find_one({"_id": ObjectId(current_user_id)})
-
-    if not user:
-        return jsonify({
-            "message": "User not found",
-            "statusCode": 404,
-            "data": {}
-        }), 404
-
     page = int(request.args.get("page", 1))
     limit = int(request.args.get("limit", 10))
     search = request.args.get("search", "")
+    sort = request.args.get("sort", "id")
 
     if page < 1:
         page = 1
@@ -478,10 +526,11 @@ def get_all_dbs_paginated():
     # Build query
     query = {}
 
-    if user.get("role") != Role.admin.value:
-        allowed_db_ids = user.get("allowed_dbs", [])
-        if allowed_db_ids:
-            object_ids = [ObjectId(db_id) for db_id in allowed_db_ids]
+    # Role and allowed DBs come from the token claims (kept fresh by token versions)
+    if not is_admin():
+        allowed = allowed_db_ids()
+        if allowed:
+            object_ids = [ObjectId(db_id) for db_id in sorted(allowed)]
             query["_id"] = {"$in": object_ids}
         else:
             # No allowed DBs for this user
@@ -491,7 +540,7 @@ def get_all_dbs_paginated():
                 "statusCode": 200,
                 "data": {
                     "data": [],
-                    "meta": {
+                    "meta": cursor_meta(limit, None) if "cursor" in request.args else {
                         "total": 0,
                         "page": page,
                         "limit": limit,
@@ -504,17 +553,39 @@ def get_all_dbs_paginated():
 
     if search:
         query["$or"] = [
-            {"name": {"$regex": search, "$options": "i"}},
-            {"short_code": {"$regex": search, "$options": "i"}}
+            {"name": {"$regex": re.escape(search), "$options": "i"}},
+            {"short_code": {"$regex": re.escape(search), "$options": "i"}}
         ]
 
-    total = db.dbs.count_documents(query)
+    # Cursor mode: keyset pagination, selected by passing `cursor` (empty for the first page)
+    if "cursor" in request.args:
+        if sort not in DB_CURSOR_SORTS:
+            return jsonify({
+                "message": f"Invalid sort value. Must be one of: {', '.join(DB_CURSOR_SORTS)}",
+                "statusCode": 400,
+                "data": {}
+            }), 400
 
-    dbs = list(
-        db.dbs.find(query)
-        .skip(skip)
-        .limit(limit)
-    )
+        try:
+            dbs, next_cursor = find_page_by_cursor(
+                db.dbs, query, request.args.get("cursor"), limit, DB_CURSOR_SORTS[sort]
+            )
+        except ValueError as e:
+            return jsonify({"message": str(e), "statusCode": 400, "data": {}}), 400
+
+        pagination = cursor_meta(limit, next_cursor)
+    else:
+        total, dbs = find_page_by_offset(db.dbs, query, skip, limit)
+
+        page_count = ceil(total / limit) if total else 1
+        pagination = {
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pageCount": page_count,
+            "hasNextPage": page < page_count,
+            "hasPrevPage": page > 1
+        }
 
     clean_dbs = []
     for item in dbs:
@@ -525,16 +596,6 @@ def get_all_dbs_paginated():
             )
         )
 
-    page_count = ceil(total / limit) if total else 1
-    pagination = {
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "pageCount": page_count,
-        "hasNextPage": page < page_count,
-        "hasPrevPage": page > 1
-    }
-
     return jsonify({
         "message": "Databases fetched successfully",
         "statusCode": 200,
@@ -603,6 +664,7 @@ def update_db(dbId: str):
         {"_id": obj_id},
         {"$set": update_dict}
     )
+    db_directory.refresh()
 
     return jsonify({
         "message": "Database updated successfully",
@@ -639,6 +701,8 @@ def delete_db(dbId: str):
         }), 404
 
     db.dbs.delete_one({"_id": obj_id})
+    db_directory.refresh()
+    record_removed(DBS, [database])
 
     # Delete all personnel belonging to this DB
     db.personnel.delete_many({"db_id": dbId})
@@ -1,99 +1,102 @@
-from flask import jsonify
 from flask_jwt_extended import jwt_required
 from datetime import datetime, timedelta
 from flask import Blueprint, jsonify
 from core.db import db
 from bson import ObjectId
+from models.personnel import PersonnelStatus
+from core.stats import month_key, USERS, PERSONNELS, DBS
+from core.cache import analytics_cache, DASHBOARD_KEY, db_analytics_key
+from core.access import db_access_required
+from utils.helpers import is_deleted
 
 analytics_bp = Blueprint("analytics", __name__)
 
-@analytics_bp.get("/dashboard")
-@jwt_required()
-def get_dashboard_analytics():
+def month_keys():
+    """Returns the stats month keys ("YYYY-MM") for this month and the previous one."""
     now = datetime.utcnow()
     first_day_this_month = datetime(now.year, now.month, 1)
-    
-    # Handle previous month
-    if now.month == 1:
-        first_day_prev_month = datetime(now.year-1, 12, 1)
-    else:
-        first_day_prev_month = datetime(now.year, now.month-1, 1)
     last_day_prev_month = first_day_this_month - timedelta(seconds=1)
+    return month_key(first_day_this_month), month_key(last_day_prev_month)
 
-    def calculate_percentage(current, previous):
-        if previous == 0:
-            return 100 if current > 0 else 0
-        return round(((current - previous) / previous) * 100, 2)
-
-    # --- USERS ---
-    total_users = db.users.count_documents({})
-    users_this_month = db.users.count_documents({"created_at": {"$gte": first_day_this_month}})
-    users_prev_month = db.users.count_documents({
-        "created_at": {"$gte": first_day_prev_month, "$lte": last_day_prev_month}
-    })
-    users_pct = calculate_percentage(users_this_month, users_prev_month)
-
-    # --- PERSONNELS (exclude soft-deleted) ---
-    not_deleted_query = {"$or": [{"isDeleted": False}, {"isDeleted": {"$exists": False}}]}
-    total_personnel = db.personnels.count_documents(not_deleted_query)
-    personnel_this_month = db.personnels.count_documents({**not_deleted_query, "created_at": {"$gte": first_day_this_month}})
-    personnel_prev_month = db.personnels.count_documents({
-        **not_deleted_query,
-        "created_at": {"$gte": first_day_prev_month, "$lte": last_day_prev_month}
-    })
-    personnel_pct = calculate_percentage(personnel_this_month, personnel_prev_month)
-
-    # --- DELETED PERSONNEL ---
-    total_deleted = db.personnels.count_documents({"isDeleted": True})
-    deleted_this_month = db.personnels.count_documents({"isDeleted": True, "created_at": {"$gte": first_day_this_month}})
-    deleted_prev_month = db.personnels.count_documents({
-        "isDeleted": True,
-        "created_at": {"$gte": first_day_prev_month, "$lte": last_day_prev_month}
-    })
-    deleted_pct = calculate_percentage(deleted_this_month, deleted_prev_month)
-
-    # --- NEW PERSONNEL (added this month) ---
-    new_personnel = personnel_this_month
-    new_personnel_prev_month = personnel_prev_month
-    new_personnel_pct = calculate_percentage(new_personnel, new_personnel_prev_month)
-
-    # --- DATABASES ---
-    total_dbs = db.dbs.count_documents({})
-    dbs_this_month = db.dbs.count_documents({"created_at": {"$gte": first_day_this_month}})
-    dbs_prev_month = db.dbs.count_documents({
-        "created_at": {"$gte": first_day_prev_month, "$lte": last_day_prev_month}
-    })
-    dbs_pct = calculate_percentage(dbs_this_month, dbs_prev_month)
 
-    return jsonify({
+def calculate_percentage(current, previous):
+    if previous == 0:
+        return 100 if current > 0 else 0
+    return round(((current - previous) / previous) * 100, 2)
+
+
+def month_bucket_counts(this_month, prev_month):
+    """$group accumulators summing counters overall, for this month and for the previous month."""
+    return {
+        "total": {"$sum": "$count"},
+        "this_month": {"$sum": {"$cond": [{"$eq": ["$month", this_month]}, "$count", 0]}},
+        "prev_month": {"$sum": {"$cond": [{"$eq": ["$month", prev_month]}, "$count", 0]}},
+    }
+
+
+EMPTY_COUNTS = {"total": 0, "this_month": 0, "prev_month": 0}
+
+
+def count_with_buckets(match, group_key, months):
+    """Sums the matching stats counters and returns one row per group key."""
+    pipeline = [
+        {"$match": match},
+        {"$group": {"_id": group_key, **month_bucket_counts(*months)}}
+    ]
+    return list(db.stats.aggregate(pipeline))
+
+
+def summarize(counts):
+    return {
+        "total": counts["total"],
+        "percentage_increase": calculate_percentage(counts["this_month"], counts["prev_month"])
+    }
+
+
+@analytics_bp.get("/dashboard")
+@jwt_required()
+def get_dashboard_analytics():
+    cached = analytics_cache.get(DASHBOARD_KEY)
+    if cached is not None:
+        return jsonify(cached), 200
+
+    months = month_keys()
+
+    # Read the maintained counters instead of counting the collections
+    rows = count_with_buckets(
+        {"scope": {"$in": [USERS, PERSONNELS, DBS]}},
+        {"scope": "$scope", "isDeleted": "$isDeleted"},
+        months
+    )
+    grouped = {(row["_id"]["scope"], row["_id"].get("isDeleted")): row for row in rows}
+
+    users = grouped.get((USERS, None), EMPTY_COUNTS)
+    live = grouped.get((PERSONNELS, False), EMPTY_COUNTS)
+    deleted = grouped.get((PERSONNELS, True), EMPTY_COUNTS)
+    dbs = grouped.get((DBS, None), EMPTY_COUNTS)
+
+    response = {
         "message": "Dashboard analytics fetched successfully",
         "statusCode": 200,
         "data": {
-            "users": {
-                "total": total_users,
-                "percentage_increase": users_pct
-            },
-            "personnel": {
-                "total": total_personnel,
-                "percentage_increase": personnel_pct
-            },
-            "deleted_personnel": {
-                "total": total_deleted,
-                "percentage_increase": deleted_pct
-            },
+            "users": summarize(users),
+            "personnel": summarize(live),
+            "deleted_personnel": summarize(deleted),
+            # New personnel are the live personnel added this month
             "new_personnel": {
-                "total": new_personnel,
-                "percentage_increase": new_personnel_pct
+                "total": live["this_month"],
+                "percentage_increase": calculate_percentage(live["this_month"], live["prev_month"])
             },
-            "databases": {
-                "total": total_dbs,
-                "percentage_increase": dbs_pct
-            }
+            "databases": summarize(dbs)
         }
-    }), 200
+    }
+    analytics_cache.set(DASHBOARD_KEY, response)
+
+    return jsonify(response), 200
 
 @analytics_bp.get("/personnels/db/<db_id>")
 @jwt_required()
+@db_access_required
 def get_personnel_analytics_by_db(db_id):
     # Validate DB ID
     try:
@@ -101,93 +104,54 @@ def get_personnel_analytics_by_db(db_id):
     except:
         return jsonify({"message": "Invalid DB ID", "statusCode": 400}), 400
 
-    now = datetime.utcnow()
-    first_day_this_month = datetime(now.year, now.month, 1)
+    cache_key = db_analytics_key(str(db_obj_id))
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return jsonify(cached), 200
+
+    # Counters for the DB, bucketed by status and soft-delete state
+    groups = count_with_buckets(
+        {"scope": PERSONNELS, "db_id": str(db_obj_id)},
+        {"status": "$status", "isDeleted": "$isDeleted"},
+        month_keys()
+    )
+
+    def total_where(predicate):
+        counts = dict(EMPTY_COUNTS)
+        for row in groups:
+            if predicate(row["_id"]):
+                for field in counts:
+                    counts[field] += row[field]
+        return summarize(counts)
+
+    data = {
+        # --- TOTAL PERSONNEL (exclude soft-deleted) ---
+        "total_personnel": total_where(lambda key: not is_deleted(key)),
+        # --- DELETED PERSONNEL ---
+        "total_deleted_personnel": total_where(is_deleted),
+    }
 
-    # Previous month
-    if now.month == 1:
-        first_day_prev_month = datetime(now.year - 1, 12, 1)
-    else:
-        first_day_prev_month = datetime(now.year, now.month - 1, 1)
-    last_day_prev_month = first_day_this_month - timedelta(seconds=1)
+    # --- BY STATUS (soft-deleted personnel included) ---
+    for status in PersonnelStatus:
+        data[f"total_{status.value}_personnel"] = total_where(
+            lambda key, status=status: key.get("status") == status.value
+        )
 
-    def percentage_increase(current, previous):
-        if previous == 0:
-            return 100 if current > 0 else 0
-        return round(((current - previous) / previous) * 100, 2)
-
-    query_base = {"db_id": str(db_obj_id)}
-
-    def count_by_query(query):
-        """Returns (total, pct) for a given query."""
-        total = db.personnels.count_documents(query)
-        this_month = db.personnels.count_documents({
-            **query, "created_at": {"$gte": first_day_this_month}
-        })
-        prev_month = db.personnels.count_documents({
-            **query,
-            "created_at": {"$gte": first_day_prev_month, "$lte": last_day_prev_month}
-        })
-        return total, percentage_increase(this_month, prev_month)
-
-    # --- TOTAL PERSONNEL (exclude soft-deleted) ---
-    not_deleted_query = {
-        **query_base,
-        "$or": [{"isDeleted": False}, {"isDeleted": {"$exists": False}}]
+    response = {
+        "message": "Personnel analytics fetched successfully",
+        "statusCode": 200,
+        "data": data
     }
-    total_personnel, total_pct = count_by_query(not_deleted_query)
+    analytics_cache.set(cache_key, response)
 
-    # --- BY STATUS ---
-    active_total, active_pct = count_by_query({**query_base, "status": "active"})
-    inactive_total, inactive_pct = count_by_query({**query_base, "status": "inactive"})
-    awol_total, awol_pct = count_by_query({**query_base, "status": "awol"})
-    death_total, death_pct = count_by_query({**query_base, "status": "death"})
-    rtu_total, rtu_pct = count_by_query({**query_base, "status": "rtu"})
-    posted_total, posted_pct = count_by_query({**query_base, "status": "posted"})
-    cse_total, cse_pct = count_by_query({**query_base, "status": "cse"})
+    return jsonify(response), 200
 
-    # --- DELETED PERSONNEL ---
-    deleted_total, deleted_pct = count_by_query({**query_base, "isDeleted": True})
 
+@analytics_bp.get("/cache")
+@jwt_required()
+def get_analytics_cache_stats():
     return jsonify({
-        "message": "Personnel analytics fetched successfully",
+        "message": "Analytics cache stats fetched successfully",
         "statusCode": 200,
-        "data": {
-            "total_personnel": {
-                "total": total_personnel,
-                "percentage_increase": total_pct
-            },
-            "total_active_personnel": {
-                "total": active_total,
-                "percentage_increase": active_pct
-            },
-            "total_inactive_personnel": {
-                "total": inactive_total,
-                "percentage_increase": inactive_pct
-            },
-            "total_awol_personnel": {
-                "total": awol_total,
-                "percentage_increase": awol_pct
-            },
-            "total_death_personnel": {
-                "total": death_total,
-                "percentage_increase": death_pct
-            },
-            "total_rtu_personnel": {
-                "total": rtu_total,
-                "percentage_increase": rtu_pct
-            },
-            "total_posted_personnel": {
-                "total": posted_total,
-                "percentage_increase": posted_pct
-            },
-            "total_cse_personnel": {
-                "total": cse_total,
-                "percentage_increase": cse_pct
-            },
-            "total_deleted_personnel": {
-                "total": deleted_total,
-                "percentage_increase": deleted_pct
-            }
-        }
+        "data": analytics_cache.stats()
     }), 200
@@ -1,14 +1,42 @@
 from flask import Blueprint, request
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from core.db import db
-from core.security import verify_password, hash_password
-from models.schema import LoginSchema, ChangePasswordSchema, CreateAdminSchema, Role, CreateUserSchema
-from models.personnel import CreateDBSchema
+from core.security import verify_password, hash_password, needs_rehash
+from models.schema import LoginSchema, ChangePasswordSchema, Role
+from core.access import TOKEN_VERSION_CLAIM
+from utils.dbs import resolve_allowed_dbs
 from bson import ObjectId
 from pydantic import ValidationError
 
 auth_bp = Blueprint("auth", __name__)
 
+# Everything login needs from the user document, in one fetch
+LOGIN_PROJECTION = {
+    "first_name": 1, "last_name": 1, "army_number": 1, "role": 1, "allowed_dbs": 1,
+    "is_generated": 1, "access_all_db": 1, "password_hash": 1, "token_version": 1,
+}
+
+
+def login_user_data(user):
+    """
+    The user returned by login: the fields CreateUserSchema / CreateAdminSchema
+    exposed (with their defaults), with allowed_dbs expanded to DB details.
+    """
+    user_data = {
+        "id": str(user["_id"]),
+        "first_name": user["first_name"],
+        "last_name": user["last_name"],
+        "army_number": user["army_number"],
+        "role": user["role"],
+        # Populate allowed_dbs with full DB details (from the DB directory)
+        "allowed_dbs": resolve_allowed_dbs([user.get("allowed_dbs")])[0],
+    }
+    if user["role"] == Role.admin.value:
+        user_data["access_all_db"] = user.get("access_all_db", False)
+    else:
+        user_data["is_generated"] = user.get("is_generated", False)
+    return user_data
+
 
 @auth_bp.post("/login")
 def login():
@@ -21,15 +49,7 @@ def login():
             "data": {}
         }, 400
 
-    user = db.users.find_one({"army_number": data.army_number})
-    if not user:
-        return {
-            "message": "Invalid credentials",
-            "statusCode": 401,
-            "data": {}
-        }, 401
-
-    user = db.users.find_one({"army_number": data.army_number})
+    user = db.users.find_one({"army_number": data.army_number}, LOGIN_PROJECTION)
     if not user or not verify_password(data.password, user["password_hash"]):
         return {
             "message": "Invalid credentials",
@@ -37,50 +57,29 @@ def login():
             "data": {}
         }, 401
 
+    # Upgrade hashes made with a different BCRYPT_ROUNDS while we have the password
+    if needs_rehash(user["password_hash"]):
+        db.users.update_one(
+            {"_id": user["_id"], "password_hash": user["password_hash"]},
+            {"$set": {"password_hash": hash_password(data.password)}}
+        )
+
     token = create_access_token(
         identity=str(user["_id"]),
         additional_claims={
             "role": user["role"],
             "army_number": user["army_number"],
-            "allowed_dbs": user.get("allowed_dbs", [])
+            "allowed_dbs": user.get("allowed_dbs", []),
+            TOKEN_VERSION_CLAIM: user.get("token_version", 0)
         }
     )
 
-    user_schema = None
-
-    if user['role'] == Role.admin.value:
-        user_schema = CreateAdminSchema(**user)
-    else:
-        user_schema = CreateUserSchema(**user)
-
-    user_data = user_schema.dict(
-        exclude={"password_hash", "created_at"},
-        by_alias=False
-    )
-    user_data["id"] = str(user_data["id"])
-
-    # Populate allowed_dbs with full DB details
-    if user_data.get("allowed_dbs"):
-        object_ids = [ObjectId(db_id) for db_id in user_data["allowed_dbs"]]
-
-        db_docs = list(db.dbs.find({"_id": {"$in": object_ids}}))
-
-        full_dbs = [
-            CreateDBSchema(**db_doc).dict(by_alias=False,
-                                          exclude={"created_at"})
-            for db_doc in db_docs
-        ]
-
-        user_data["allowed_dbs"] = full_dbs
-    else:
-        user_data["allowed_dbs"] = []
-
     return {
         "message": "Login successfully",
         "statusCode": 200,
         "data": {
             "token": token,
-            "user": user_data
+            "user": login_user_data(user)
         }
     }
 
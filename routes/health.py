@@ -0,0 +1,58 @@
+import time
+import pymongo
+from flask import Blueprint, jsonify
+from pymongo.errors import PyMongoError
+from core.config import settings
+from core.db import get_client
+from core.telemetry import pool_snapshots
+
+health_bp = Blueprint("health", __name__)
+
+
+@health_bp.get("/health")
+def health():
+    # Liveness only: the process is up and serving requests
+    return jsonify({
+        "message": "OK",
+        "statusCode": 200,
+        "data": {"status": "ok"}
+    }), 200
+
+
+@health_bp.get("/ready")
+def ready():
+    start = time.perf_counter()
+    try:
+        # Bounded well below a probe's timeout, server selection included
+        with pymongo.timeout(settings.READY_PING_TIMEOUT_MS / 1000):
+            get_client().admin.command("ping")
+        ping_ms = round((time.perf_counter() - start) * 1000, 2)
+        error = None
+    except PyMongoError as e:
+        # The full message names hosts and topology; keep it out of an unauthenticated response
+        ping_ms = None
+        error = f"MongoDB unreachable ({type(e).__name__})"
+
+    # Each client has its own pool of up to MONGO_MAX_POOL_SIZE.
+    # Not ready when MongoDB is unreachable or a pool is exhausted with a queue building up
+    pools = pool_snapshots()
+    saturated = []
+    for name, pool in pools.items():
+        pool["maxPoolSize"] = settings.MONGO_MAX_POOL_SIZE
+        if pool["checkedOut"] >= settings.MONGO_MAX_POOL_SIZE and pool["waiting"] > settings.READY_MAX_WAITING:
+            saturated.append(name)
+
+    is_ready = error is None and not saturated
+    status_code = 200 if is_ready else 503
+
+    data = {"status": "ready" if is_ready else "unavailable", "pingMs": ping_ms, "pools": pools}
+    if error:
+        data["error"] = error
+    elif saturated:
+        data["error"] = f"Connection pool exhausted: {', '.join(saturated)}"
+
+    return jsonify({
+        "message": "Ready" if is_ready else "Not ready",
+        "statusCode": status_code,
+        "data": data
+    }), status_code
@@ -0,0 +1,32 @@
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from core.db import db
+from models.schema import Role
+from bson import ObjectId
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.get("/<jobId>")
+@jwt_required()
+def get_job(jobId):
+    try:
+        obj_id = ObjectId(jobId)
+    except:
+        return jsonify({"message": "Invalid job ID", "statusCode": 400}), 400
+
+    job = db.jobs.find_one({"_id": obj_id})
+    if not job:
+        return jsonify({"message": "Job not found", "statusCode": 404}), 404
+
+    # Only the submitter and admins can see a job (it carries row-level errors)
+    if get_jwt().get("role") != Role.admin.value and job.get("created_by") != get_jwt_identity():
+        return jsonify({"message": "Job not found", "statusCode": 404}), 404
+
+    job["id"] = job.pop("_id")
+
+    return jsonify({
+        "message": "Job fetched successfully",
+        "statusCode": 200,
+        "data": job
+    }), 200
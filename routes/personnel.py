@@ -1,13 +1,71 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
-from models.personnel import Personnel, PersonnelStatus
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from models.personnel import Personnel, PersonnelStatus, PersonnelUpdate
 from pydantic import ValidationError
+from core.config import settings
 from core.db import db
+from core.codecs import for_response
+from core.directory import db_directory
+from core.access import db_access_required, db_access_denied, has_db_access, db_scope
+from core.stats import (
+    record_personnel_created, record_personnel_changed, personnel_guard,
+    PERSONNEL_KEY_FIELDS, PERSONNEL_KEY_PROJECTION
+)
 from bson import ObjectId, errors
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
 from math import ceil
+from utils.helpers import (
+    find_page_by_cursor, find_page_by_offset, cursor_meta, not_deleted, is_deleted, read_pipeline,
+    parse_fields, field_projection
+)
+from utils.search import search_tokens, search_condition, PERSONNEL_SEARCH_FIELDS, SEARCH_MODES
+from utils.bulk import (
+    insert_personnel_batch, import_personnel_rows, open_text_stream,
+    iter_csv_rows, iter_ndjson_rows, IMPORT_FORMATS
+)
+from utils.export import stream_export, EXPORT_FORMATS, EXPORT_PROJECTION
+from core.jobs import submit_personnel_upload
+import csv
+
+# search_tokens (the search index) and delete_op (which bulk delete flipped
+# the row, see bulk_delete_personnel) are internal and never returned
+HIDDEN_FIELDS = {"search_tokens": 0, "delete_op": 0}
+
+# Listing responses also leave out db_id (the caller asked by DB)
+LISTING_HIDDEN_FIELDS = {**HIDDEN_FIELDS, "db_id": 0}
+
+# Fields a caller may select with ?fields= (id is always returned)
+PERSONNEL_FIELDS = tuple(name for name in Personnel.model_fields if name not in ("id", "db_id"))
+
+# Guarded (compare-and-set) writes retried when a concurrent request changed the row first
+GUARDED_WRITE_ATTEMPTS = 3
+
+# Sort orders accepted in cursor mode (?sort=) and the fields they page on
+PERSONNEL_CURSOR_SORTS = {"id": "_id", "last_name": "last_name"}
 
 personnel_bp = Blueprint("personnels", __name__)
 
+
+def listing_projection(fields, *extra):
+    """LISTING_HIDDEN_FIELDS, or only the selected `fields` (plus `extra`) when ?fields= was given."""
+    return LISTING_HIDDEN_FIELDS if fields is None else field_projection(fields, *extra)
+
+
+def duplicate_army_number():
+    return jsonify({
+        "message": "Personnel with this army_number already exists in this DB",
+        "statusCode": 400
+    }), 400
+
+
+def concurrent_update():
+    return jsonify({
+        "message": "Personnel was changed by another request, please retry",
+        "statusCode": 409
+    }), 409
+
+
 @personnel_bp.post("/")
 @jwt_required()
 def create_personnel():
@@ -17,14 +75,17 @@ def create_personnel():
     if not db_id:
         return jsonify({"message": "db_id is required", "statusCode": 400}), 400
 
+    if not has_db_access(db_id):
+        return db_access_denied()
+
     # Validate DB ID
     try:
-        obj_id = ObjectId(db_id)
+        ObjectId(db_id)
     except:
         return jsonify({"message": "Invalid db_id", "statusCode": 400}), 400
 
     # Ensure DB exists
-    if not db.dbs.find_one({"_id": obj_id}):
+    if not db_directory.exists(db_id):
         return jsonify({"message": "DB not found", "statusCode": 404}), 404
 
     # Unique army_number within the same db
@@ -42,7 +103,9 @@ def create_personnel():
 
     doc = personnel_schema.dict(by_alias=True)
     doc.pop("_id", None)
+    doc["search_tokens"] = search_tokens(doc, PERSONNEL_SEARCH_FIELDS)
     db.personnels.insert_one(doc)
+    record_personnel_created([doc])
 
     return jsonify({
         "message": "Personnel created successfully",
@@ -53,29 +116,27 @@ def create_personnel():
 
 @personnel_bp.get("/")
 @jwt_required()
+@db_access_required
 def get_all_personnels():
     db_id = request.args.get("db_id")
 
-    query = {
-        "$or": [{"isDeleted": False}, {"isDeleted": {"$exists": False}}]
-    }
+    try:
+        fields = parse_fields(request.args.get("fields"), PERSONNEL_FIELDS)
+    except ValueError as e:
+        return jsonify({"message": str(e), "statusCode": 400}), 400
+
+    query = not_deleted(db_scope())
     if db_id:
         query["db_id"] = db_id
 
-    personnels = list(db.personnels.find(query))
-
-    # Transform documents for frontend
-    formatted_personnels = []
-    for p in personnels:
-        p_formatted = p.copy()  # avoid modifying original
-        p_formatted["id"] = str(p_formatted.pop("_id"))  # replace _id with id
-        p_formatted.pop("db_id", None)  # remove db_id if exists
-        formatted_personnels.append(p_formatted)
+    # Shaped for the frontend by the query itself (_id as id, no db_id)
+    pipeline = read_pipeline(query, listing_projection(fields))
+    personnels = list(for_response(db.personnels).aggregate(pipeline))
 
     return jsonify({
         "message": "Personnels fetched successfully",
         "statusCode": 200,
-        "data": formatted_personnels
+        "data": personnels
     }), 200
 
 
@@ -87,15 +148,24 @@ def get_personnel(personnelId):
     except:
         return jsonify({"message": "Invalid personnel ID", "statusCode": 400}), 400
 
-    personnel = db.personnels.find_one({"_id": obj_id})
+    try:
+        fields = parse_fields(request.args.get("fields"), PERSONNEL_FIELDS)
+    except ValueError as e:
+        return jsonify({"message": str(e), "statusCode": 400}), 400
+
+    # db_id is always read for the access check
+    projection = HIDDEN_FIELDS if fields is None else field_projection(fields, "db_id")
+    personnel = db.personnels.find_one({"_id": obj_id}, projection)
     if not personnel:
         return jsonify({
             "message": "Personnel not found",
             "statusCode": 404
         }), 404
 
-    # personnel["_id"] = str(personnel["_id"])
-    personnel["id"] = str(personnel.pop("_id"))  # replace _id with id
+    if not has_db_access(personnel.get("db_id")):
+        return db_access_denied()
+
+    personnel["id"] = personnel.pop("_id")  # replace _id with id
     personnel.pop("db_id", None)  # remove db_id if exists
 
     return jsonify({
@@ -113,56 +183,73 @@ def update_personnel(personnelId):
     except:
         return jsonify({"message": "Invalid personnel ID", "statusCode": 400}), 400
 
-    personnel = db.personnels.find_one({"_id": obj_id})
+    personnel = db.personnels.find_one({"_id": obj_id}, HIDDEN_FIELDS)
     if not personnel:
         return jsonify({
             "message": "Personnel not found",
             "statusCode": 404
         }), 404
 
-    data = request.get_json() or {}
+    if not has_db_access(personnel.get("db_id")):
+        return db_access_denied()
+
+    # Only the supplied fields are validated, and only the ones that differ are written
+    try:
+        data = PersonnelUpdate.model_validate(request.get_json() or {}).model_dump(exclude_unset=True)
+    except ValidationError as e:
+        return jsonify({"message": e.errors(include_context=False), "statusCode": 400}), 400
+
+    changes = {field: value for field, value in data.items() if personnel.get(field) != value}
+    if not changes:
+        return jsonify({
+            "message": "Personnel updated successfully",
+            "statusCode": 200
+        }), 200
 
     # If db_id is being changed, validate it
-    if "db_id" in data:
-        new_db_id = data["db_id"]
+    if "db_id" in changes:
+        new_db_id = changes["db_id"]
+        if not has_db_access(new_db_id):
+            return db_access_denied()
+
         try:
-            new_obj_id = ObjectId(new_db_id)
+            ObjectId(new_db_id)
         except:
             return jsonify({"message": "Invalid db_id", "statusCode": 400}), 400
 
-        if not db.dbs.find_one({"_id": new_obj_id}):
+        if not db_directory.exists(new_db_id):
             return jsonify({"message": "DB not found", "statusCode": 404}), 404
 
-    # If army_number is changing, ensure uniqueness per DB
-    new_army_num = data.get("army_number", personnel["army_number"])
-    new_db_id = data.get("db_id", personnel["db_id"])
+    updated = {**personnel, **changes}
 
-    exists = db.personnels.find_one({
-        "army_number": new_army_num,
-        "db_id": new_db_id,
-        "_id": {"$ne": obj_id}
-    })
+    # If army_number or db_id is changing, ensure uniqueness per DB
+    # (the unique index still catches a concurrent duplicate at write time)
+    if "army_number" in changes or "db_id" in changes:
+        exists = db.personnels.find_one({
+            "army_number": updated["army_number"],
+            "db_id": updated["db_id"],
+            "_id": {"$ne": obj_id}
+        }, {"_id": 1})
 
-    if exists:
-        return jsonify({
-            "message": "Personnel with this army_number already exists in this DB",
-            "statusCode": 400
-        }), 400
+        if exists:
+            return duplicate_army_number()
 
-    updated = {**personnel, **data}
+    if any(field in changes for field in PERSONNEL_SEARCH_FIELDS):
+        changes["search_tokens"] = search_tokens(updated, PERSONNEL_SEARCH_FIELDS)
 
+    # Counter moves need the row to still be as read (see personnel_guard)
+    moves_counters = any(field in changes for field in PERSONNEL_KEY_FIELDS)
     try:
-        updated_schema = Personnel(**updated)
-    except ValidationError as e:
-        return jsonify({"message": e.errors(), "statusCode": 400}), 400
-
-    payload = updated_schema.dict(by_alias=True)
-    payload.pop("_id", None) 
-    payload.pop("id", None) 
-    db.personnels.update_one(
-        {"_id": obj_id},
-        {"$set": payload}
-    )
+        result = db.personnels.update_one(
+            personnel_guard(personnel) if moves_counters else {"_id": obj_id},
+            {"$set": changes}
+        )
+    except DuplicateKeyError:
+        return duplicate_army_number()
+    if moves_counters:
+        if result.modified_count != 1:
+            return concurrent_update()
+        record_personnel_changed([(personnel, updated)])
 
     return jsonify({
         "message": "Personnel updated successfully",
@@ -178,11 +265,31 @@ def delete_personnel(personnelId):
     except:
         return jsonify({"message": "Invalid personnel ID", "statusCode": 400}), 400
 
-    personnel = db.personnels.find_one({"_id": obj_id})
+    personnel = db.personnels.find_one({"_id": obj_id}, PERSONNEL_KEY_PROJECTION)
     if not personnel:
         return jsonify({"message": "Personnel not found", "statusCode": 404}), 404
 
-    db.personnels.update_one({"_id": obj_id}, {"$set": {"isDeleted": True}})
+    if not has_db_access(personnel.get("db_id")):
+        return db_access_denied()
+
+    # Flip the row only while it is as read, so concurrent deletes or status
+    # changes of the same row cannot move its counters twice
+    for _ in range(GUARDED_WRITE_ATTEMPTS):
+        if is_deleted(personnel):
+            break
+
+        result = db.personnels.update_one(personnel_guard(personnel), {"$set": {"isDeleted": True}})
+        if result.modified_count == 1:
+            record_personnel_changed([(personnel, {**personnel, "isDeleted": True})])
+            break
+
+        personnel = db.personnels.find_one({"_id": obj_id}, PERSONNEL_KEY_PROJECTION)
+        if not personnel:
+            return jsonify({"message": "Personnel not found", "statusCode": 404}), 404
+        if not has_db_access(personnel.get("db_id")):
+            return db_access_denied()
+    else:
+        return concurrent_update()
 
     return jsonify({
         "message": "Personnel deleted successfully",
@@ -192,11 +299,14 @@ def delete_personnel(personnelId):
 
 @personnel_bp.get("/db/<db_id>")
 @jwt_required()
+@db_access_required
 def get_personnel_by_db(db_id):
     page = int(request.args.get("page", 1))
     limit = int(request.args.get("limit", 10))
     search = request.args.get("search")
     status_filter = request.args.get("filter")
+    search_mode = request.args.get("search_mode", "prefix")
+    sort = request.args.get("sort", "id")
 
     if page < 1:
         page = 1
@@ -205,23 +315,27 @@ def get_personnel_by_db(db_id):
 
     skip = (page - 1) * limit
 
+    try:
+        fields = parse_fields(request.args.get("fields"), PERSONNEL_FIELDS)
+    except ValueError as e:
+        return jsonify({"message": str(e), "statusCode": 400}), 400
+
     # Build query using $and to safely combine conditions
-    conditions = [
-        {"$or": [{"isDeleted": False}, {"isDeleted": {"$exists": False}}]}
-    ]
+    conditions = [not_deleted()]
 
     if db_id:
         conditions.append({"db_id": db_id})
 
     if search:
-        conditions.append({
-            "$or": [
-                {"first_name": {"$regex": search, "$options": "i"}},
-                {"last_name": {"$regex": search, "$options": "i"}},
-                {"middle_name": {"$regex": search, "$options": "i"}},
-                {"army_number": {"$regex": search, "$options": "i"}},
-            ]
-        })
+        if search_mode not in SEARCH_MODES:
+            return jsonify({
+                "message": f"Invalid search_mode value. Must be one of: {', '.join(SEARCH_MODES)}",
+                "statusCode": 400
+            }), 400
+
+        condition = search_condition(search, PERSONNEL_SEARCH_FIELDS, search_mode)
+        if condition:
+            conditions.append(condition)
 
     # Apply status filter if provided and not "all"
     if status_filter and status_filter.lower() != "all":
@@ -236,49 +350,117 @@ def get_personnel_by_db(db_id):
 
     query = {"$and": conditions}
 
-    total = db.personnels.count_documents(query)
-
-    personnels = list(
-        db.personnels
-        .find(query)
-        .skip(skip)
-        .limit(limit)
-    )
+    # Cursor mode: keyset pagination, selected by passing `cursor` (empty for the first page)
+    if "cursor" in request.args:
+        if sort not in PERSONNEL_CURSOR_SORTS:
+            return jsonify({
+                "message": f"Invalid sort value. Must be one of: {', '.join(PERSONNEL_CURSOR_SORTS)}",
+                "statusCode": 400
+            }), 400
 
-    formatted_personnels = []
-    for p in personnels:
-        p_formatted = p.copy()
-        p_formatted["id"] = str(p_formatted.pop("_id"))
-        p_formatted.pop("db_id", None)
-        formatted_personnels.append(p_formatted)
-
-    page_count = ceil(total / limit) if total else 1
-
-    pagination = {
-        "total": total,
-        "page": page,
-        "limit": limit,
-        "pageCount": page_count,
-        "hasNextPage": page < page_count,
-        "hasPrevPage": page > 1
-    }
+        try:
+            personnels, next_cursor = find_page_by_cursor(
+                db.personnels, query, request.args.get("cursor"), limit, PERSONNEL_CURSOR_SORTS[sort],
+                # The cursor is built from the sort field, so it is always read
+                projection=listing_projection(fields, PERSONNEL_CURSOR_SORTS[sort]), as_id=True
+            )
+        except ValueError as e:
+            return jsonify({"message": str(e), "statusCode": 400}), 400
+
+        if fields is not None and sort not in fields:
+            for personnel in personnels:
+                personnel.pop(PERSONNEL_CURSOR_SORTS[sort], None)
+
+        pagination = cursor_meta(limit, next_cursor)
+    else:
+        total, personnels = find_page_by_offset(
+            db.personnels, query, skip, limit, listing_projection(fields), as_id=True
+        )
+
+        page_count = ceil(total / limit) if total else 1
+
+        pagination = {
+            "total": total,
+            "page": page,
+            "limit": limit,
+            "pageCount": page_count,
+            "hasNextPage": page < page_count,
+            "hasPrevPage": page > 1
+        }
 
     return jsonify({
         "message": "Personnels fetched successfully",
         "statusCode": 200,
         "data": {
-            "data": formatted_personnels,
+            "data": personnels,
             "meta": pagination
         },
     }), 200
 
 
+@personnel_bp.get("/db/<db_id>/export")
+@jwt_required()
+@db_access_required
+def export_personnel_by_db(db_id):
+    file_format = request.args.get("format", "csv")
+    status_filter = request.args.get("filter")
+
+    if file_format not in EXPORT_FORMATS:
+        return jsonify({
+            "message": f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}",
+            "statusCode": 400
+        }), 400
+
+    try:
+        ObjectId(db_id)
+    except:
+        return jsonify({"message": "Invalid db_id", "statusCode": 400}), 400
+
+    db_doc = db_directory.get(db_id)
+    if not db_doc:
+        return jsonify({"message": "DB not found", "statusCode": 404}), 404
+
+    query = not_deleted({"db_id": db_id})
+    if status_filter and status_filter.lower() != "all":
+        valid_statuses = [s.value for s in PersonnelStatus]
+        if status_filter.lower() not in valid_statuses:
+            return jsonify({
+                "message": f"Invalid filter value. Must be one of: all, {', '.join(valid_statuses)}",
+                "statusCode": 400
+            }), 400
+        query["status"] = status_filter.lower()
+
+    # Streamed straight from the cursor in _id order (served by the db_id/_id index)
+    cursor = (
+        db.personnels
+        .find(query, EXPORT_PROJECTION)
+        .sort("_id", 1)
+        .batch_size(settings.EXPORT_BATCH_SIZE)
+    )
+
+    compress = request.accept_encodings["gzip"] > 0
+    filename = f"{db_doc.get('short_code') or db_id}-personnel.{file_format}"
+
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+
+    return Response(
+        stream_with_context(stream_export(cursor, file_format, compress)),
+        mimetype=EXPORT_FORMATS[file_format],
+        headers=headers
+    )
+
+
 @personnel_bp.post("/upload")
 @jwt_required()
 def bulk_personnel_upload():
     data = request.get_json()
     
-    if not isinstance(data, list):
+    if not isinstance(data, list) or not data or not isinstance(data[0], dict):
         return jsonify({
             "message": "Payload must be an array of Personnel",
             "statusCode": 400
@@ -289,64 +471,90 @@ def bulk_personnel_upload():
     if not db_id:
         return jsonify({"message": "db_id is required", "statusCode": 400}), 400
 
+    if not has_db_access(db_id):
+        return db_access_denied()
+
     # Validate DB ID format
     try:
-        obj_id = ObjectId(db_id)
+        ObjectId(db_id)
     except:
         return jsonify({"message": "Invalid db_id", "statusCode": 400}), 400
 
     # Ensure DB exists
-    if not db.dbs.find_one({"_id": obj_id}):
+    if not db_directory.exists(db_id):
         return jsonify({"message": "DB not found", "statusCode": 404}), 404
 
-    valid_docs = []
-    errors = []
-
-    for index, item in enumerate(data):
-        # ensure db_id consistency
-        if item.get("db_id") != db_id:
-            errors.append({
-                "index": index,
-                "error": "db_id mismatch in item"
-            })
-            continue
-
-        # unique army_number per DB
-        if db.personnels.find_one({"army_number": item["army_number"], "db_id": db_id}):
-            errors.append({
-                "index": index,
-                "error": f"Personnel with army_number {item['army_number']} already exists"
-            })
-            continue
-
-        # Pydantic validation
-        try:
-            p = Personnel(**item)
-        except ValidationError as e:
-            errors.append({
-                "index": index,
-                "error": e.errors()
-            })
-            continue
-
-        doc = p.dict(by_alias=False)
-        doc.pop("_id", None)
-        valid_docs.append(doc)
-
-    # Insert valid docs
-    if valid_docs:
-        db.personnels.insert_many(valid_docs)
+    # ?async=true: queue a background job and return right away
+    if request.args.get("async", "").lower() in ("1", "true"):
+        job_id = submit_personnel_upload(db_id, data, created_by=get_jwt_identity())
+        return jsonify({
+            "message": "Bulk upload accepted",
+            "statusCode": 202,
+            "data": {"job_id": str(job_id), "status": "queued"}
+        }), 202
+
+    inserted, errors = insert_personnel_batch(db_id, data)
 
     return jsonify({
         "message": "Bulk upload completed",
         "statusCode": 207 if errors else 201,
         "data": {
-            "inserted": len(valid_docs),
+            "inserted": inserted,
             "failed": errors
         }
     }), 207 if errors else 201
 
 
+@personnel_bp.post("/import")
+@jwt_required()
+@db_access_required
+def stream_personnel_import():
+    db_id = request.args.get("db_id")
+    if not db_id:
+        return jsonify({"message": "db_id is required", "statusCode": 400}), 400
+
+    # Validate DB ID format
+    try:
+        ObjectId(db_id)
+    except:
+        return jsonify({"message": "Invalid db_id", "statusCode": 400}), 400
+
+    # Ensure DB exists
+    if not db_directory.exists(db_id):
+        return jsonify({"message": "DB not found", "statusCode": 404}), 404
+
+    # Format from ?format=, else from the Content-Type
+    file_format = request.args.get("format")
+    if not file_format:
+        content_type = request.mimetype or ""
+        file_format = "csv" if "csv" in content_type else "ndjson" if "ndjson" in content_type else None
+
+    if file_format not in IMPORT_FORMATS:
+        return jsonify({
+            "message": f"Invalid format. Must be one of: {', '.join(IMPORT_FORMATS)}",
+            "statusCode": 400
+        }), 400
+
+    # Parse the body incrementally (gzip is detected from the content)
+    text_stream = open_text_stream(request.stream)
+    rows = iter_csv_rows(text_stream, db_id) if file_format == "csv" else iter_ndjson_rows(text_stream, db_id)
+
+    try:
+        result = import_personnel_rows(db_id, rows)
+    except (csv.Error, UnicodeDecodeError, OSError, EOFError) as e:
+        return jsonify({
+            "message": f"Import stopped, the file could not be read: {e}",
+            "statusCode": 400
+        }), 400
+
+    status_code = 207 if result["failedCount"] else 201
+    return jsonify({
+        "message": "Import completed",
+        "statusCode": status_code,
+        "data": result
+    }), status_code
+
+
 @personnel_bp.delete("/bulk-delete")
 @jwt_required()
 def bulk_delete_personnel():
@@ -382,17 +590,54 @@ def bulk_delete_personnel():
             "statusCode": 400
         }), 400
 
-    result = db.personnels.update_many(
-        {"_id": {"$in": object_ids}},
-        {"$set": {"isDeleted": True}}
-    )
+    # Snapshot the rows that are about to flip so the counters can follow
+    # Only rows in DBs the caller can access are affected
+    scope = {**db_scope(), "_id": {"$in": object_ids}}
 
-    if result.matched_count == 0:
+    found = list(db.personnels.find(scope, PERSONNEL_KEY_PROJECTION))
+    if not found:
         return jsonify({
             "message": "No personnels found to delete",
             "statusCode": 404
         }), 404
 
+    # Each row flips only while it is as read (see personnel_guard). The writes
+    # carry this request's delete_op, so after a partial miss the rows it did
+    # flip are known; the others are read again and retried, as in delete_personnel
+    delete_op = ObjectId()
+    pending = [p for p in found if not is_deleted(p)]
+    for _ in range(GUARDED_WRITE_ATTEMPTS):
+        if not pending:
+            break
+
+        result = db.personnels.bulk_write([
+            UpdateOne(personnel_guard(p), {"$set": {"isDeleted": True, "delete_op": delete_op}})
+            for p in pending
+        ], ordered=False)
+
+        if result.modified_count == len(pending):
+            flipped, pending = pending, []
+        else:
+            pending_ids = [p["_id"] for p in pending]
+            flipped_ids = {
+                doc["_id"] for doc in db.personnels.find({"_id": {"$in": pending_ids}, "delete_op": delete_op}, {"_id": 1})
+            }
+            flipped = [p for p in pending if p["_id"] in flipped_ids]
+            missed_ids = [pid for pid in pending_ids if pid not in flipped_ids]
+            pending = [
+                p for p in db.personnels.find({**scope, "_id": {"$in": missed_ids}}, PERSONNEL_KEY_PROJECTION)
+                if not is_deleted(p)
+            ]
+
+        record_personnel_changed([(p, {**p, "isDeleted": True}) for p in flipped])
+
+    if pending:
+        return jsonify({
+            "message": "Some personnels were changed by another request, please retry",
+            "conflict_ids": [str(p["_id"]) for p in pending],
+            "statusCode": 409
+        }), 409
+
     return jsonify({
         "message": "Personnels deleted successfully",
         "statusCode": 200
@@ -0,0 +1,14 @@
+from core.db import db
+
+
+def backfill_is_deleted():
+    # Rows written before isDeleted existed (missing or null) are live rows
+    result = db.personnels.update_many(
+        {"isDeleted": None},
+        {"$set": {"isDeleted": False}}
+    )
+    print(f"Backfilled isDeleted=false on {result.modified_count} personnel")
+
+
+if __name__ == "__main__":
+    backfill_is_deleted()
@@ -0,0 +1,36 @@
+from pymongo import UpdateOne
+from core.db import db
+from utils.search import search_tokens, PERSONNEL_SEARCH_FIELDS, USER_SEARCH_FIELDS
+
+BATCH_SIZE = 1000
+
+
+def backfill(collection, fields):
+    projection = {field: 1 for field in fields}
+    ops = []
+    updated = 0
+
+    for doc in collection.find({}, projection).batch_size(BATCH_SIZE):
+        ops.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"search_tokens": search_tokens(doc, fields)}}
+        ))
+        if len(ops) == BATCH_SIZE:
+            updated += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+
+    if ops:
+        updated += collection.bulk_write(ops, ordered=False).modified_count
+
+    return updated
+
+
+def backfill_search_tokens():
+    # Recompute search_tokens for every personnel and user
+    personnels = backfill(db.personnels, PERSONNEL_SEARCH_FIELDS)
+    users = backfill(db.users, USER_SEARCH_FIELDS)
+    print(f"Updated search_tokens on {personnels} personnel and {users} user(s)")
+
+
+if __name__ == "__main__":
+    backfill_search_tokens()
@@ -1,4 +1,6 @@
 from core.db import db
+from core.stats import record_created, USERS
+from utils.search import search_tokens, USER_SEARCH_FIELDS
 from core.security import hash_password
 from models.schema import CreateAdminSchema, Role
 from pydantic import ValidationError
@@ -28,7 +30,10 @@ def create_admin():
         return
 
     # Insert into MongoDB
-    result = db.users.insert_one(admin_schema.dict())
+    admin_doc = admin_schema.dict()
+    admin_doc["search_tokens"] = search_tokens(admin_doc, USER_SEARCH_FIELDS)
+    result = db.users.insert_one(admin_doc)
+    record_created(USERS, [admin_doc])
     print(f"Admin created: army_number={admin_data['army_number']} password=AdminPassSuper123, id={result.inserted_id}")
 
 
@@ -0,0 +1,27 @@
+import sys
+from core.stats import reconcile_counters
+
+
+def rebuild_stats(apply=True):
+    # Recount every counter from the source collections and compare
+    drift = reconcile_counters(apply=apply)
+
+    if not drift:
+        print("Stats counters are in sync")
+        return
+
+    for key, (stored, actual) in sorted(drift.items(), key=lambda item: str(item[0])):
+        scope, db_id, status, is_deleted, month = key
+        print(
+            f"{scope} db_id={db_id} status={status} isDeleted={is_deleted} "
+            f"month={month}: stored={stored} actual={actual}"
+        )
+
+    if apply:
+        print(f"Fixed {len(drift)} drifted counter(s)")
+    else:
+        print(f"{len(drift)} drifted counter(s) found (dry run, nothing written)")
+
+
+if __name__ == "__main__":
+    rebuild_stats(apply="--dry-run" not in sys.argv)
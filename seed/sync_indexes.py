@@ -0,0 +1,25 @@
+import sys
+from core.db import db
+from core.indexes import sync_indexes
+
+
+def run_sync(drop=True, dry_run=False):
+    report = sync_indexes(db, drop=drop, dry_run=dry_run)
+
+    for collection_name, changes in report.items():
+        print(f"[{collection_name}]")
+        for action in ("created", "rebuilt", "dropped"):
+            for name in changes[action]:
+                print(f"  {action}: {name}")
+        for name in changes["unused"]:
+            print(f"  unused (no recorded accesses): {name}")
+
+    if dry_run:
+        print("Dry run, no indexes were changed")
+
+
+if __name__ == "__main__":
+    run_sync(
+        drop="--keep-obsolete" not in sys.argv,
+        dry_run="--dry-run" in sys.argv
+    )
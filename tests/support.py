@@ -0,0 +1,90 @@
+"""
+Shared test setup: the app on an in-memory MongoDB (mongomock), with an
+admin token. Run the suite with `python -m unittest discover -s tests`.
+"""
+import os
+import types
+import unittest
+from datetime import datetime
+from unittest import mock
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+
+try:
+    import mongomock
+except ImportError:  # dev dependency: `uv sync --group dev`
+    mongomock = None
+
+from pymongo import InsertOne, UpdateMany, UpdateOne
+
+
+def bulk_write(self, requests, ordered=True, **kwargs):
+    # mongomock's bulk_write does not accept the operations of recent PyMongo releases
+    modified = 0
+    for op in requests:
+        if isinstance(op, UpdateOne):
+            modified += self.update_one(op._filter, op._doc, upsert=op._upsert).modified_count
+        elif isinstance(op, UpdateMany):
+            modified += self.update_many(op._filter, op._doc, upsert=op._upsert).modified_count
+        elif isinstance(op, InsertOne):
+            self.insert_one(op._doc)
+        else:
+            raise TypeError(f"Unsupported bulk operation {op!r}")
+    return types.SimpleNamespace(modified_count=modified)
+
+
+def personnel(i, db_id, created_at=None):
+    doc = {
+        "first_name": "First", "last_name": f"Last{i}", "army_number": f"N/{i}",
+        "phone_number": "0800", "rank": "Cpl", "bank": {"name": "Bank", "sort_code": "011"},
+        "acct_number": "0123", "sub_sector": "S1", "db_id": db_id, "status": "active",
+        "isDeleted": False,
+    }
+    if created_at:
+        doc["created_at"] = created_at
+    return doc
+
+
+@unittest.skipIf(mongomock is None, "mongomock is not installed")
+class AppTestCase(unittest.TestCase):
+    """Fresh database and app per test; subclasses add data in seed()."""
+
+    def setUp(self):
+        import core.db
+        from core.access import token_versions
+        from core.cache import analytics_cache
+
+        client = mongomock.MongoClient()
+        patches = [
+            mock.patch.object(core.db, "MongoClient", lambda *args, **kwargs: client),
+            mock.patch.object(core.db, "_client", None),
+            mock.patch.object(mongomock.collection.Collection, "bulk_write", bulk_write, create=True),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        analytics_cache.clear()
+        token_versions.clear()
+
+        from app import create_app
+        from flask_jwt_extended import create_access_token
+
+        self.db = core.db.get_db()
+        self.seed()
+
+        # The directory snapshot would otherwise outlive the previous test's database
+        from core.directory import db_directory
+        db_directory.refresh()
+
+        self.app = create_app()
+        self.client = self.app.test_client()
+        admin_id = self.db.users.insert_one({
+            "first_name": "Admin", "last_name": "User", "army_number": "ADMIN", "role": "admin",
+            "created_at": datetime.utcnow(),
+        }).inserted_id
+        with self.app.app_context():
+            token = create_access_token(identity=str(admin_id), additional_claims={"role": "admin"})
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def seed(self):
+        pass
@@ -0,0 +1,215 @@
+"""
+Dashboard analytics against an in-memory MongoDB (mongomock): the endpoint
+must report the same numbers as the original implementation, which ran 15
+count_documents queries over the source collections.
+
+    python -m unittest discover -s tests
+"""
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from bson import ObjectId
+from support import AppTestCase, mongomock, personnel
+
+
+def month_starts(now):
+    first_day_this_month = datetime(now.year, now.month, 1)
+    last_day_prev_month = first_day_this_month - timedelta(seconds=1)
+    return first_day_this_month, datetime(last_day_prev_month.year, last_day_prev_month.month, 1)
+
+
+def legacy_dashboard(database):
+    """The dashboard numbers as the original 15-query implementation computed them."""
+    first_day_this_month, first_day_prev_month = month_starts(datetime.utcnow())
+    last_day_prev_month = first_day_this_month - timedelta(seconds=1)
+
+    def pct(current, previous):
+        if previous == 0:
+            return 100 if current > 0 else 0
+        return round(((current - previous) / previous) * 100, 2)
+
+    def summary(collection, query):
+        total = collection.count_documents(query)
+        this_month = collection.count_documents({**query, "created_at": {"$gte": first_day_this_month}})
+        prev_month = collection.count_documents({
+            **query, "created_at": {"$gte": first_day_prev_month, "$lte": last_day_prev_month}
+        })
+        return {"total": total, "percentage_increase": pct(this_month, prev_month)}
+
+    not_deleted_query = {"$or": [{"isDeleted": False}, {"isDeleted": {"$exists": False}}]}
+    personnel = summary(database.personnels, not_deleted_query)
+
+    return {
+        "users": summary(database.users, {}),
+        "personnel": personnel,
+        "deleted_personnel": summary(database.personnels, {"isDeleted": True}),
+        "new_personnel": {
+            "total": database.personnels.count_documents({
+                **not_deleted_query, "created_at": {"$gte": first_day_this_month}
+            }),
+            "percentage_increase": personnel["percentage_increase"],
+        },
+        "databases": summary(database.dbs, {}),
+    }
+
+
+class DashboardAnalyticsTest(AppTestCase):
+
+    def seed(self):
+        first_day_this_month, first_day_prev_month = month_starts(datetime.utcnow())
+        self.this_month = first_day_this_month + timedelta(hours=1)
+        self.prev_month = first_day_prev_month + timedelta(days=10)
+        self.old = first_day_prev_month - timedelta(days=45)
+        months = [self.this_month, self.prev_month, self.old]
+
+        self.db_ids = [
+            str(self.db.dbs.insert_one({
+                "name": f"DB{i}", "short_code": f"D{i}", "description": "", "created_at": months[i % 3]
+            }).inserted_id)
+            for i in range(5)
+        ]
+        for i in range(7):
+            self.db.users.insert_one({
+                "first_name": "F", "last_name": f"L{i}", "army_number": f"U{i}", "role": "user",
+                "allowed_dbs": [], "created_at": months[i % 3],
+            })
+
+        statuses = ["active", "inactive", "awol", "death"]
+        for i in range(60):
+            doc = personnel(i, self.db_ids[i % 2], months[i % 3])
+            doc["status"] = statuses[i % 4]
+            if i % 5 == 0:
+                doc["isDeleted"] = True
+            elif i % 5 == 1:
+                del doc["isDeleted"]  # written before isDeleted existed
+            self.db.personnels.insert_one(doc)
+
+    def prepare_counters(self):
+        # Deployment steps: backfill isDeleted, then build the stats counters
+        from core.stats import reconcile_counters
+        from seed.backfill_is_deleted import backfill_is_deleted
+
+        backfill_is_deleted()
+        reconcile_counters(apply=True)
+
+    def dashboard(self):
+        response = self.client.get("/analytics/dashboard", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()["data"]
+
+    def test_matches_legacy_counts(self):
+        expected = legacy_dashboard(self.db)
+        self.prepare_counters()
+        self.assertEqual(self.dashboard(), expected)
+
+    def test_counters_follow_writes(self):
+        self.prepare_counters()
+
+        response = self.client.post("/personnels/", json=personnel(100, self.db_ids[2]), headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(
+            "/personnels/upload", json=[personnel(i, self.db_ids[3]) for i in range(101, 106)],
+            headers=self.headers
+        )
+        self.assertIn(response.status_code, (200, 201))
+
+        live = [str(doc["_id"]) for doc in self.db.personnels.find({"isDeleted": False}).limit(6)]
+        self.assertEqual(self.client.delete(f"/personnels/{live[0]}", headers=self.headers).status_code, 200)
+        self.client.delete("/personnels/bulk-delete", json={"personnels_id": live[1:]}, headers=self.headers)
+
+        status_change = str(self.db.personnels.find_one({"isDeleted": False, "status": "active"})["_id"])
+        self.client.patch(f"/personnels/{status_change}", json={"status": "awol"}, headers=self.headers)
+
+        self.assertEqual(self.dashboard(), legacy_dashboard(self.db))
+
+
+    def race(self, first, second):
+        """Runs request `second` just before the first personnel write of request `first`."""
+        update_one = mongomock.collection.Collection.update_one
+        pending = [second]
+
+        def racing_update_one(collection, *args, **kwargs):
+            if pending and collection.name == "personnels":
+                pending.pop()()
+            return update_one(collection, *args, **kwargs)
+
+        with mock.patch.object(mongomock.collection.Collection, "update_one", racing_update_one):
+            return first()
+
+    def assert_counters_exact(self):
+        from core.stats import reconcile_counters
+        self.assertEqual(reconcile_counters(apply=False), {})
+        self.assertEqual(self.dashboard(), legacy_dashboard(self.db))
+
+    def test_concurrent_deletes_move_counters_once(self):
+        self.prepare_counters()
+        live = [str(doc["_id"]) for doc in self.db.personnels.find({"isDeleted": False}).limit(3)]
+
+        delete = lambda pid: self.client.delete(f"/personnels/{pid}", headers=self.headers)
+        response = self.race(lambda: delete(live[0]), lambda: delete(live[0]))
+        self.assertEqual(response.status_code, 200)
+
+        bulk_delete = lambda: self.client.delete(
+            "/personnels/bulk-delete", json={"personnels_id": live}, headers=self.headers
+        )
+        response = self.race(lambda: delete(live[1]), bulk_delete)
+        self.assertEqual(response.status_code, 200)
+
+        # A row of the bulk delete changes first: that row is read again and retried
+        more = [str(doc["_id"]) for doc in self.db.personnels.find({"isDeleted": False}).limit(4)]
+        patch = lambda: self.client.patch(f"/personnels/{more[-1]}", json={"status": "cse"}, headers=self.headers)
+        bulk_delete = lambda: self.client.delete(
+            "/personnels/bulk-delete", json={"personnels_id": more}, headers=self.headers
+        )
+        self.assertEqual(self.race(bulk_delete, patch).status_code, 200)
+        deleted = {"_id": {"$in": [ObjectId(pid) for pid in more]}, "isDeleted": True}
+        self.assertEqual(self.db.personnels.count_documents(deleted), 4)
+
+        self.assert_counters_exact()
+
+    def test_bulk_delete_gives_up_on_a_row_that_keeps_changing(self):
+        self.prepare_counters()
+        live = [doc["_id"] for doc in self.db.personnels.find({"isDeleted": False}).limit(3)]
+        statuses = iter(["awol", "rtu", "cse", "posted"])
+        update_one = mongomock.collection.Collection.update_one
+
+        def racing_update_one(collection, filter, update, *args, **kwargs):
+            # Every bulk delete attempt on live[0] loses to a status change
+            if filter.get("_id") == live[0] and "delete_op" in update.get("$set", {}):
+                self.client.patch(f"/personnels/{live[0]}", json={"status": next(statuses)}, headers=self.headers)
+            return update_one(collection, filter, update, *args, **kwargs)
+
+        with mock.patch.object(mongomock.collection.Collection, "update_one", racing_update_one):
+            response = self.client.delete(
+                "/personnels/bulk-delete", json={"personnels_id": [str(pid) for pid in live]}, headers=self.headers
+            )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.get_json()["conflict_ids"], [str(live[0])])
+        self.assertEqual(self.db.personnels.count_documents({"_id": {"$in": live}, "isDeleted": True}), 2)
+        self.assert_counters_exact()
+
+    def test_status_change_racing_a_delete(self):
+        self.prepare_counters()
+        doc = self.db.personnels.find_one({"isDeleted": False, "status": "active"})
+        pid = str(doc["_id"])
+
+        patch = lambda: self.client.patch(f"/personnels/{pid}", json={"status": "awol"}, headers=self.headers)
+        delete = lambda: self.client.delete(f"/personnels/{pid}", headers=self.headers)
+
+        # The delete retries against the new status; the stale status change is refused
+        self.assertEqual(self.race(delete, patch).status_code, 200)
+        self.assertTrue(self.db.personnels.find_one({"_id": doc["_id"]})["isDeleted"])
+        other = self.db.personnels.find_one({"isDeleted": False, "status": "inactive"})
+        other_id = str(other["_id"])
+        patch_other = lambda: self.client.patch(
+            f"/personnels/{other_id}", json={"status": "rtu"}, headers=self.headers
+        )
+        delete_other = lambda: self.client.delete(f"/personnels/{other_id}", headers=self.headers)
+        self.assertEqual(self.race(patch_other, delete_other).status_code, 409)
+
+        self.assert_counters_exact()
+
+
+if __name__ == "__main__":
+    unittest.main()
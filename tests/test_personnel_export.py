@@ -0,0 +1,57 @@
+"""
+An export (CSV or NDJSON) fed back to /personnels/import recreates the same
+personnel in another DB, under new ids.
+"""
+import unittest
+from support import AppTestCase, personnel
+
+# Differ between the original and the imported copy by design
+ROW_SPECIFIC_FIELDS = ("_id", "db_id", "search_tokens")
+
+
+class PersonnelExportTest(AppTestCase):
+
+    def seed(self):
+        self.source, self.target = (
+            str(self.db.dbs.insert_one({"name": f"DB{i}", "short_code": f"D{i}", "description": ""}).inserted_id)
+            for i in range(2)
+        )
+        # Stored in the shape the write routes produce
+        from models.personnel import Personnel
+        from utils.validation import to_doc
+
+        for i in range(5):
+            doc = personnel(i, self.source)
+            if i % 2:
+                doc["middle_name"], doc["remark"], doc["status"] = "M", "On course, \"B\" coy", "cse"
+            self.db.personnels.insert_one(to_doc(Personnel.model_validate(doc)))
+
+    def rows(self, db_id):
+        return sorted(
+            ({k: v for k, v in doc.items() if k not in ROW_SPECIFIC_FIELDS} for doc in self.db.personnels.find({"db_id": db_id})),
+            key=lambda doc: doc["army_number"]
+        )
+
+    def round_trip(self, file_format, content_type):
+        exported = self.client.get(f"/personnels/db/{self.source}/export?format={file_format}", headers=self.headers)
+        self.assertEqual(exported.status_code, 200)
+
+        response = self.client.post(
+            f"/personnels/import?db_id={self.target}", data=exported.get_data(),
+            headers={**self.headers, "Content-Type": content_type}
+        )
+        self.assertEqual(response.status_code, 201, response.get_json())
+        self.assertEqual(response.get_json()["data"]["inserted"], 5)
+
+        self.assertEqual(self.rows(self.target), self.rows(self.source))
+        self.assertEqual(self.db.personnels.count_documents({"id": {"$exists": True}}), 0)
+
+    def test_csv_round_trip(self):
+        self.round_trip("csv", "text/csv")
+
+    def test_ndjson_round_trip(self):
+        self.round_trip("ndjson", "application/x-ndjson")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+POST /personnels/import: streamed CSV / NDJSON (optionally gzipped) rows are
+inserted chunk by chunk; bad rows are reported by index without stopping the rest.
+"""
+import gzip
+import json
+import unittest
+from unittest import mock
+from support import AppTestCase, personnel
+
+CSV_HEADER = "first_name,last_name,army_number,phone_number,rank,bank.name,bank.sort_code,acct_number,sub_sector\n"
+
+
+def csv_line(i):
+    return f"First,Last{i},N/{i},0800,Cpl,Bank,011,0123,S1\n"
+
+
+class PersonnelImportTest(AppTestCase):
+
+    def seed(self):
+        self.db_id = str(self.db.dbs.insert_one({"name": "DB", "short_code": "D", "description": ""}).inserted_id)
+
+    def post(self, data, content_type):
+        return self.client.post(
+            f"/personnels/import?db_id={self.db_id}", data=data,
+            headers={**self.headers, "Content-Type": content_type}
+        )
+
+    def test_good_file_across_chunks(self):
+        from core.config import settings
+
+        body = gzip.compress((CSV_HEADER + "".join(csv_line(i) for i in range(7))).encode())
+        with mock.patch.object(settings, "IMPORT_CHUNK_SIZE", 3):
+            response = self.post(body, "text/csv")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()["data"], {"inserted": 7, "failedCount": 0, "failed": []})
+        doc = self.db.personnels.find_one({"army_number": "N/3"})
+        self.assertEqual((doc["db_id"], doc["bank"], doc["status"]), (self.db_id, {"name": "Bank", "sort_code": "011"}, "active"))
+        self.assertNotIn("id", doc)
+
+    def test_duplicate_in_file(self):
+        body = CSV_HEADER + csv_line(1) + csv_line(2) + csv_line(1)
+        response = self.post(body, "text/csv")
+
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()["data"]
+        self.assertEqual((data["inserted"], data["failedCount"]), (2, 1))
+        self.assertEqual(data["failed"], [{"index": 2, "error": "Duplicate army_number N/1 in upload"}])
+
+    def test_malformed_line(self):
+        lines = [json.dumps(personnel(1, self.db_id)), '{"first_name": "First", ', json.dumps(personnel(2, self.db_id))]
+        response = self.post("\n".join(lines) + "\n", "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 207)
+        data = response.get_json()["data"]
+        self.assertEqual((data["inserted"], data["failedCount"]), (2, 1))
+        self.assertEqual(data["failed"][0]["index"], 1)
+        self.assertTrue(data["failed"][0]["error"].startswith("Invalid JSON"))
+        self.assertEqual(self.db.personnels.count_documents({"db_id": self.db_id}), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
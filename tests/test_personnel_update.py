@@ -0,0 +1,45 @@
+"""
+PATCH /personnels/<id>: the body schema follows Personnel, and a duplicate
+army_number is a 400 even when it only shows up at write time.
+"""
+import unittest
+from unittest import mock
+from support import AppTestCase, mongomock, personnel
+
+
+class PersonnelUpdateTest(AppTestCase):
+
+    def seed(self):
+        self.db_id = str(self.db.dbs.insert_one({"name": "DB", "short_code": "D", "description": ""}).inserted_id)
+        self.db.personnels.create_index([("db_id", 1), ("army_number", 1)], unique=True)
+        self.pid = str(self.db.personnels.insert_one(personnel(1, self.db_id)).inserted_id)
+
+    def patch(self, body):
+        return self.client.patch(f"/personnels/{self.pid}", json=body, headers=self.headers)
+
+    def test_schema_follows_personnel(self):
+        from models.personnel import Personnel, PersonnelUpdate
+
+        self.assertEqual(set(PersonnelUpdate.model_fields), set(Personnel.model_fields) - {"id"})
+        self.assertEqual(self.patch({"remark": None}).status_code, 200)
+        self.assertEqual(self.patch({"rank": None}).status_code, 400)
+        self.assertEqual(self.patch({"status": "unknown"}).status_code, 400)
+
+    def test_duplicate_army_number_written_concurrently(self):
+        # The other row appears after the pre-check, so only the unique index sees it
+        find_one = mongomock.collection.Collection.find_one
+
+        def racing_find_one(collection, filter=None, *args, **kwargs):
+            if isinstance(filter, dict) and "_id" in filter and "$ne" in str(filter["_id"]):
+                collection.insert_one(personnel(2, self.db_id))
+                return None
+            return find_one(collection, filter, *args, **kwargs)
+
+        with mock.patch.object(mongomock.collection.Collection, "find_one", racing_find_one):
+            response = self.patch({"army_number": "N/2"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()["message"], "Personnel with this army_number already exists in this DB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,216 @@
+import csv
+import gzip
+import io
+import json
+from pymongo.errors import BulkWriteError
+from core.config import settings
+from core.db import db
+from core.stats import record_personnel_created
+from utils.search import search_tokens, PERSONNEL_SEARCH_FIELDS
+from utils.validation import validate_personnel
+
+DUPLICATE_KEY_ERROR = 11000
+GZIP_MAGIC = b"\x1f\x8b"
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+def insert_personnel_batch(db_id, items, offset=0, indexes=None):
+    """
+    Validates and inserts one batch of personnel rows for `db_id` with a single
+    duplicate lookup and a single unordered insert.
+
+    Returns (inserted, failed) where `failed` holds {"index", "error"} entries
+    and `index` is the row's position in the whole upload: `indexes[position]`
+    when given, else `offset` + position.
+    """
+    failed = []
+    candidates = []
+
+    for position, item in enumerate(items):
+        index = indexes[position] if indexes is not None else offset + position
+
+        if not isinstance(item, dict):
+            failed.append({"index": index, "error": "Item must be an object"})
+            continue
+
+        # ensure db_id consistency
+        if item.get("db_id") != db_id:
+            failed.append({"index": index, "error": "db_id mismatch in item"})
+            continue
+
+        candidates.append((index, item))
+
+    # unique army_number per DB: one $in lookup for the batch, plus repeats inside it.
+    # Rows whose army_number is missing or not a string skip this and fail validation.
+    army_numbers = {
+        item.get("army_number") for _, item in candidates if isinstance(item.get("army_number"), str)
+    }
+    existing = {
+        doc["army_number"]
+        for doc in db.personnels.find(
+            {"db_id": db_id, "army_number": {"$in": list(army_numbers)}},
+            {"army_number": 1, "_id": 0}
+        )
+    } if army_numbers else set()
+
+    seen = set()
+    to_validate = []
+
+    for index, item in candidates:
+        army_number = item.get("army_number")
+
+        if not isinstance(army_number, str):
+            to_validate.append((index, item))
+            continue
+
+        if army_number in existing:
+            failed.append({
+                "index": index,
+                "error": f"Personnel with army_number {army_number} already exists"
+            })
+            continue
+
+        if army_number in seen:
+            failed.append({
+                "index": index,
+                "error": f"Duplicate army_number {army_number} in upload"
+            })
+            continue
+        seen.add(army_number)
+        to_validate.append((index, item))
+
+    # Pydantic validation, batched (and across processes for large batches)
+    validated = validate_personnel(
+        [item for _, item in to_validate],
+        processes=settings.VALIDATION_PROCESSES,
+        chunk_size=settings.VALIDATION_CHUNK_SIZE,
+        min_parallel_rows=settings.VALIDATION_PARALLEL_MIN_ROWS
+    )
+
+    docs, doc_indexes = [], []
+    for (index, _), (doc, errors) in zip(to_validate, validated):
+        if errors:
+            failed.append({"index": index, "error": errors})
+            continue
+
+        doc["search_tokens"] = search_tokens(doc, PERSONNEL_SEARCH_FIELDS)
+        docs.append(doc)
+        doc_indexes.append(index)
+
+    if not docs:
+        return 0, sorted(failed, key=lambda f: f["index"])
+
+    # Unordered insert: one bad row does not stop the rest of the batch
+    rejected = set()
+    try:
+        db.personnels.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for write_error in e.details.get("writeErrors", []):
+            position = write_error["index"]
+            rejected.add(position)
+            if write_error.get("code") == DUPLICATE_KEY_ERROR:
+                error = f"Personnel with army_number {docs[position]['army_number']} already exists"
+            else:
+                error = write_error.get("errmsg", "Insert failed")
+            failed.append({"index": doc_indexes[position], "error": error})
+
+    inserted_docs = [doc for position, doc in enumerate(docs) if position not in rejected]
+    record_personnel_created(inserted_docs)
+
+    return len(inserted_docs), sorted(failed, key=lambda f: f["index"])
+
+
+# --- Streaming import ---
+
+def open_text_stream(stream):
+    """
+    Wraps a binary request stream as text, transparently gunzipping it when
+    it starts with the gzip magic bytes. Nothing is read ahead beyond a buffer.
+    """
+    buffered = io.BufferedReader(stream)
+    if buffered.peek(2)[:2] == GZIP_MAGIC:
+        buffered = io.BufferedReader(gzip.GzipFile(fileobj=buffered, mode="rb"))
+    return io.TextIOWrapper(buffered, encoding="utf-8-sig", newline="")
+
+
+def csv_row_to_item(row, db_id):
+    """Maps a CSV row to a Personnel payload; "bank.name"-style columns become nested objects."""
+    item = {}
+    for column, value in row.items():
+        if column is None or value is None or value == "":
+            continue
+        column = column.strip()
+        if "." in column:
+            parent, child = column.split(".", 1)
+            item.setdefault(parent, {})[child] = value
+        else:
+            item[column] = value
+    item.setdefault("db_id", db_id)
+    return item
+
+
+def iter_csv_rows(text_stream, db_id):
+    """Yields (index, item, parse_error) for each CSV data row."""
+    for index, row in enumerate(csv.DictReader(text_stream)):
+        yield index, csv_row_to_item(row, db_id), None
+
+
+def iter_ndjson_rows(text_stream, db_id):
+    """Yields (index, item, parse_error) for each non-blank NDJSON line."""
+    index = 0
+    for line in text_stream:
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            yield index, None, f"Invalid JSON: {e}"
+        else:
+            if isinstance(item, dict):
+                item.setdefault("db_id", db_id)
+            yield index, item, None
+        index += 1
+
+
+def import_personnel_rows(db_id, rows, chunk_size=None, max_reported_errors=None):
+    """
+    Validates and inserts `rows` ((index, item, parse_error) tuples) in
+    fixed-size chunks, so memory stays bounded by the chunk size whatever
+    the input size. At most `max_reported_errors` failures are kept.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    if max_reported_errors is None:
+        max_reported_errors = settings.IMPORT_MAX_REPORTED_ERRORS
+
+    result = {"inserted": 0, "failedCount": 0, "failed": []}
+
+    def record_failures(failures):
+        result["failedCount"] += len(failures)
+        room = max_reported_errors - len(result["failed"])
+        if room > 0:
+            result["failed"].extend(failures[:room])
+
+    chunk, chunk_indexes = [], []
+
+    def flush():
+        inserted, failures = insert_personnel_batch(db_id, chunk, indexes=chunk_indexes)
+        result["inserted"] += inserted
+        record_failures(failures)
+        chunk.clear()
+        chunk_indexes.clear()
+
+    for index, item, parse_error in rows:
+        if parse_error:
+            record_failures([{"index": index, "error": parse_error}])
+            continue
+
+        chunk.append(item)
+        chunk_indexes.append(index)
+        if len(chunk) >= chunk_size:
+            flush()
+
+    if chunk:
+        flush()
+
+    return result
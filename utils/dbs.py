@@ -0,0 +1,29 @@
+from core.directory import db_directory
+from models.personnel import CreateDBSchema
+
+
+def db_details(db_doc):
+    """The DB shape returned in users' allowed_dbs."""
+    return CreateDBSchema(**db_doc).dict(by_alias=False, exclude={"created_at"})
+
+
+def resolve_allowed_dbs(id_lists):
+    """
+    Expands several allowed_dbs id lists into full DB details with one
+    directory lookup over their union. Returns one list per input list, in
+    its order; unknown or malformed ids are left out.
+    """
+    known = db_directory.get_many({str(db_id) for db_ids in id_lists for db_id in db_ids or []})
+    details = {db_id: db_details(db_doc) for db_id, db_doc in known.items()}
+
+    resolved = []
+    for db_ids in id_lists:
+        seen = set()
+        dbs = []
+        for db_id in db_ids or []:
+            db_id = str(db_id)
+            if db_id in details and db_id not in seen:
+                seen.add(db_id)
+                dbs.append(details[db_id])
+        resolved.append(dbs)
+    return resolved
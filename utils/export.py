@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from enum import Enum
+
+# Column order of CSV exports; "bank.name"-style columns are nested fields,
+# the same convention the CSV import reads (see utils/bulk.py)
+EXPORT_COLUMNS = [
+    "id", "first_name", "last_name", "middle_name", "army_number", "phone_number",
+    "rank", "bank.name", "bank.sort_code", "acct_number", "sub_sector",
+    "location", "remark", "status", "created_at",
+]
+
+# Only the exported fields are read from MongoDB
+EXPORT_PROJECTION = {column.split(".", 1)[0]: 1 for column in EXPORT_COLUMNS if column != "id"}
+
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# Rows are buffered into chunks of roughly this many bytes before being sent
+FLUSH_BYTES = 64 * 1024
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+def export_row(doc):
+    """Flattens a personnel document into {column: value} for EXPORT_COLUMNS."""
+    row = {}
+    for column in EXPORT_COLUMNS:
+        if column == "id":
+            value = str(doc["_id"])
+        elif "." in column:
+            parent, child = column.split(".", 1)
+            value = (doc.get(parent) or {}).get(child)
+        else:
+            value = doc.get(column)
+        row[column] = export_value(value)
+    return row
+
+
+def iter_csv_lines(docs):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    for doc in docs:
+        writer.writerow(export_row(doc))
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def iter_ndjson_lines(docs):
+    for doc in docs:
+        row = {"id": str(doc["_id"])}
+        row.update((k, v) for k, v in doc.items() if k != "_id")
+        yield json.dumps(row, default=export_value) + "\n"
+
+
+def iter_chunks(lines, compress=False):
+    """
+    Joins text lines into ~FLUSH_BYTES chunks of UTF-8 bytes, gzip-compressed
+    on the fly when `compress` is set. Only one chunk is held at a time.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    pending, size = [], 0
+
+    for line in lines:
+        data = line.encode("utf-8")
+        pending.append(data)
+        size += len(data)
+        if size >= FLUSH_BYTES:
+            chunk = b"".join(pending)
+            pending, size = [], 0
+            if compressor:
+                chunk = compressor.compress(chunk)
+            if chunk:
+                yield chunk
+
+    chunk = b"".join(pending)
+    if compressor:
+        chunk = compressor.compress(chunk) + compressor.flush()
+    if chunk:
+        yield chunk
+
+
+def stream_export(cursor, file_format, compress=False):
+    """Yields the encoded export of `cursor` and closes it once done (or abandoned)."""
+    lines = iter_csv_lines(cursor) if file_format == "csv" else iter_ndjson_lines(cursor)
+    try:
+        yield from iter_chunks(lines, compress)
+    finally:
+        cursor.close()
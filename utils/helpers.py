@@ -0,0 +1,148 @@
+import base64
+import binascii
+import json
+from bson import ObjectId, errors
+from core.codecs import for_response
+
+
+# --- Soft delete ---
+# Every personnel row carries isDeleted (backfilled by seed/backfill_is_deleted.py),
+# so live rows are an equality match the planner can serve from partial indexes.
+
+def not_deleted(query=None):
+    """Returns `query` restricted to rows that are not soft-deleted."""
+    return {**(query or {}), "isDeleted": False}
+
+
+def is_deleted(doc):
+    return doc.get("isDeleted") is True
+
+
+# --- Response-shaped reads ---
+# With `as_id`, reads run as an aggregation that returns `_id` as `id` and
+# applies the (exclusion) projection on the server, and are decoded with
+# core/codecs.py (ObjectId -> str, datetime -> HTTP date), so documents can be
+# handed to jsonify as-is.
+
+def id_stages(projection=None):
+    if projection and any(projection.values()):
+        # Inclusion (see field_projection): one $project the server can push down / cover
+        return [{"$project": {**projection, "_id": 0, "id": "$_id"}}]
+    return [{"$addFields": {"id": "$_id"}}, {"$project": {**(projection or {}), "_id": 0}}]
+
+
+def read_pipeline(query, projection=None, sort=None, skip=0, limit=0):
+    pipeline = [{"$match": query}]
+    if sort:
+        pipeline.append({"$sort": dict(sort)})
+    if skip:
+        pipeline.append({"$skip": skip})
+    if limit:
+        pipeline.append({"$limit": limit})
+    return pipeline + id_stages(projection)
+
+
+# --- Field selection (?fields=) ---
+
+def parse_fields(raw, allowed):
+    """
+    Returns the field names requested as `?fields=a,b` (deduplicated, in
+    order), or None when the parameter is absent. `id` is always returned and
+    may be listed. Raises ValueError for names outside `allowed`.
+    """
+    if raw is None:
+        return None
+
+    names = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in names if name != "id" and name not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Invalid fields: {', '.join(unknown)}. Must be among: id, {', '.join(allowed)}"
+        )
+    return [name for name in names if name != "id"]
+
+
+def field_projection(fields, *extra):
+    """Inclusion projection for `_id`, `fields` and `extra` (fields the route itself needs)."""
+    return {"_id": 1, **{name: 1 for name in (*fields, *extra)}}
+
+
+# --- Keyset (cursor) pagination ---
+
+def encode_cursor(doc, sort_field, id_field="_id"):
+    """Encodes the sort position of `doc` as an opaque, URL-safe cursor."""
+    last_id = str(doc[id_field])
+    values = [last_id] if sort_field == "_id" else [doc.get(sort_field), last_id]
+    raw = json.dumps({"s": sort_field, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort_field):
+    """
+    Returns the query condition selecting rows after `cursor`, or None for the
+    first page. Raises ValueError for malformed cursors or a different sort.
+    """
+    if not cursor:
+        return None
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        values = payload["v"]
+        last_id = ObjectId(values[-1])
+    except (binascii.Error, ValueError, KeyError, IndexError, TypeError, errors.InvalidId):
+        raise ValueError("Invalid cursor")
+
+    if payload.get("s") != sort_field or len(values) != (1 if sort_field == "_id" else 2):
+        raise ValueError("Cursor does not match the requested sort")
+
+    if sort_field == "_id":
+        return {"_id": {"$gt": last_id}}
+
+    return {"$or": [
+        {sort_field: {"$gt": values[0]}},
+        {sort_field: values[0], "_id": {"$gt": last_id}},
+    ]}
+
+
+def find_page_by_cursor(collection, query, cursor, limit, sort_field="_id", projection=None, as_id=False):
+    """
+    Fetches the page after `cursor` in (sort_field, _id) order without skip().
+    Returns (docs, next_cursor); next_cursor is None on the last page.
+    """
+    after = decode_cursor(cursor, sort_field)
+    if after:
+        query = {"$and": [query, after]}
+
+    sort = [("_id", 1)] if sort_field == "_id" else [(sort_field, 1), ("_id", 1)]
+    if as_id:
+        docs = list(for_response(collection).aggregate(read_pipeline(query, projection, sort, limit=limit + 1)))
+    else:
+        docs = list(collection.find(query, projection).sort(sort).limit(limit + 1))
+
+    next_cursor = None
+    if len(docs) > limit:
+        docs = docs[:limit]
+        next_cursor = encode_cursor(docs[-1], sort_field, "id" if as_id else "_id")
+
+    return docs, next_cursor
+
+
+# --- Offset pagination ---
+
+def find_page_by_offset(collection, query, skip, limit, projection=None, as_id=False):
+    """Returns (total, docs) for a skip/limit page."""
+    total = collection.count_documents(query)
+    if as_id:
+        docs = list(for_response(collection).aggregate(read_pipeline(query, projection, skip=skip, limit=limit)))
+    else:
+        docs = list(collection.find(query, projection).skip(skip).limit(limit))
+    return total, docs
+
+
+def cursor_meta(limit, next_cursor):
+    return {
+        "limit": limit,
+        "nextCursor": next_cursor,
+        "hasNextPage": next_cursor is not None
+    }
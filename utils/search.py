@@ -0,0 +1,45 @@
+import re
+
+# Personnel and users carry a `search_tokens` array: every prefix of every
+# word in their searchable fields, lowercased. A search for "oka n/175" then
+# becomes {"search_tokens": {"$all": ["oka", "n", "175"]}}, an index lookup
+# whose cost follows the number of matches rather than the collection size.
+PERSONNEL_SEARCH_FIELDS = ("first_name", "last_name", "middle_name", "army_number")
+USER_SEARCH_FIELDS = ("first_name", "last_name", "army_number")
+
+MAX_PREFIX_LENGTH = 20
+WORD_SEPARATOR = re.compile(r"[\W_]+")
+
+SEARCH_MODES = ("prefix", "contains")
+
+
+def words(value):
+    """Lowercased words of `value`, cut to the longest indexed prefix."""
+    return [w[:MAX_PREFIX_LENGTH] for w in WORD_SEPARATOR.split(str(value).lower()) if w]
+
+
+def search_tokens(doc, fields):
+    tokens = set()
+    for field in fields:
+        value = doc.get(field)
+        if not value:
+            continue
+        for word in words(value):
+            tokens.update(word[:end] for end in range(1, len(word) + 1))
+    return sorted(tokens)
+
+
+def search_condition(search, fields, mode="prefix"):
+    """
+    Query condition for `search`. "prefix" matches word prefixes through the
+    token index; "contains" is a case-insensitive substring scan on `fields`
+    with the input escaped. Returns None when there is nothing to match.
+    """
+    if mode == "contains":
+        pattern = re.escape(search)
+        return {"$or": [{field: {"$regex": pattern, "$options": "i"}} for field in fields]}
+
+    terms = words(search)
+    if not terms:
+        return None
+    return {"search_tokens": {"$all": sorted(set(terms))}}
@@ -0,0 +1,66 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from pydantic import ValidationError
+from models.personnel import Personnel
+
+# Kept free of database imports: worker processes import this module on spawn.
+
+_pool = None
+_pool_pid = None
+_pool_lock = Lock()
+
+
+def to_doc(personnel):
+    # Stored under MongoDB's own _id: a row's "id" (e.g. from an export) is not kept
+    doc = personnel.model_dump(by_alias=True)
+    doc.pop("_id", None)
+    return doc
+
+
+def validate_personnel_chunk(items):
+    """
+    Validates each item as a Personnel. Returns one (doc, errors) pair per
+    item, with errors in the same shape as Personnel(**item) raises.
+    """
+    # Per-row model_validate beats TypeAdapter(List[Personnel]) here: the
+    # list adapter is slower per row and has to re-run once any row fails
+    # (see bench/bench_validation.py).
+    results = []
+    for item in items:
+        try:
+            results.append((to_doc(Personnel.model_validate(item)), None))
+        except ValidationError as e:
+            results.append((None, e.errors()))
+    return results
+
+
+def get_pool(processes):
+    """Per-process validation pool (spawned workers), created on first use."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def validate_personnel(items, processes=0, chunk_size=500, min_parallel_rows=2000):
+    """
+    Validates personnel payloads, returning one (doc, errors) pair per item.
+    Small batches are validated in-thread; batches of at least
+    `min_parallel_rows` are split into `chunk_size` chunks across `processes`
+    worker processes when `processes` > 0.
+    """
+    if processes <= 0 or len(items) < min_parallel_rows:
+        return validate_personnel_chunk(items)
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results = []
+    for chunk_results in get_pool(processes).map(validate_personnel_chunk, chunks):
+        results.extend(chunk_results)
+    return results